@@ -0,0 +1,47 @@
+"""
+Fixtures of the pytest-benchmark suite.
+
+Only the 1k paths manifests are benchmarked by default, the larger ones are opt-in:
+
+    pytest benchmarks --benchmark-sizes=1000,100000,1000000
+"""
+
+import pytest
+from manifests import SHAPES, ChunkStore
+
+from mantaray_py import ManifestEntry, MantarayNode, Reference
+
+DEFAULT_SIZES = "1000"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--benchmark-sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma separated numbers of paths of the benchmarked manifests. Default: {DEFAULT_SIZES}",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--benchmark-sizes").split(",")]
+        metafunc.parametrize("size", sizes, scope="module")
+    if "shape" in metafunc.fixturenames:
+        metafunc.parametrize("shape", list(SHAPES), scope="module")
+
+
+@pytest.fixture(scope="module")
+def entries(shape: str, size: int) -> list[ManifestEntry]:
+    return sorted(SHAPES[shape](size))
+
+
+@pytest.fixture(scope="module")
+def saved_manifest(entries: list[ManifestEntry]) -> tuple[ChunkStore, Reference]:
+    store = ChunkStore()
+    return store, MantarayNode.from_entries(entries, presorted=True).save(store.save)
+
+
+@pytest.fixture
+def rounds(size: int) -> int:
+    """Number of rounds of the benchmarks that build a whole manifest, a 1M paths build takes a while."""
+    return max(1, min(20, 100_000 // size))
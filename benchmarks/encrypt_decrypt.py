@@ -0,0 +1,55 @@
+"""
+Microbenchmark of `encrypt_decrypt` on 4 KB chunks against the former byte by byte implementation.
+
+Run with:
+
+    python benchmarks/encrypt_decrypt.py
+"""
+
+import timeit
+from typing import Optional
+
+from mantaray_py.utils import encrypt_decrypt, encrypt_decrypt_into, gen_32_bytes
+
+CHUNK_SIZE = 4096
+NUMBER = 2000
+
+
+def loop_encrypt_decrypt(key: bytes, data: bytes, start_index: int = 0, end_index: Optional[int] = None) -> bytes:
+    """The nested loop implementation that `encrypt_decrypt` replaced."""
+    if end_index is None:
+        end_index = len(data)
+
+    data = bytearray(data)
+    for i in range(start_index, end_index, len(key)):
+        encryption_chunk_end_index = min(i + len(key), len(data))
+        encryption_chunk = data[i:encryption_chunk_end_index]
+        for j in range(len(encryption_chunk)):
+            encryption_chunk[j] ^= key[j % len(key)]
+        data[i:encryption_chunk_end_index] = encryption_chunk
+    return bytes(data)
+
+
+def main() -> None:
+    key = gen_32_bytes()
+    data = gen_32_bytes() * (CHUNK_SIZE // 32)
+    buffer = bytearray(data)
+
+    if loop_encrypt_decrypt(key, data, 32) != encrypt_decrypt(key, data, 32):
+        msg = "The implementations do not produce the same output"
+        raise AssertionError(msg)
+
+    timings = {
+        "loop": timeit.timeit(lambda: loop_encrypt_decrypt(key, data, 32), number=NUMBER),
+        "encrypt_decrypt": timeit.timeit(lambda: encrypt_decrypt(key, data, 32), number=NUMBER),
+        "encrypt_decrypt_into": timeit.timeit(lambda: encrypt_decrypt_into(key, buffer, 32), number=NUMBER),
+    }
+
+    baseline = timings["loop"]
+    for name, seconds in timings.items():
+        per_call = seconds / NUMBER * 1e6
+        print(f"{name:<22} {per_call:10.2f} us/chunk  {baseline / seconds:8.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
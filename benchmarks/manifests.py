@@ -0,0 +1,77 @@
+"""
+Synthetic manifests of several shapes and an in-process chunk store for the benchmarks.
+"""
+
+from collections.abc import Callable, Iterator
+
+from eth_utils import keccak
+
+from mantaray_py import ManifestEntry, Reference
+
+
+def _entry(index: int) -> Reference:
+    # * cheap, unique and never the zero reference
+    return (index + 1).to_bytes(32, "big")
+
+
+def flat_paths(size: int) -> Iterator[bytes]:
+    """All files in one directory."""
+    for index in range(size):
+        yield f"file-{index:07d}.txt".encode()
+
+
+def deep_paths(size: int) -> Iterator[bytes]:
+    """A directory level per digit of the index, ten subdirectories in every directory."""
+    width = len(str(max(size - 1, 1)))
+    for index in range(size):
+        *directories, name = f"{index:0{width}d}"
+        yield "/".join([*(f"dir-{digit}" for digit in directories), f"file-{name}.bin"]).encode()
+
+
+def long_prefix_paths(size: int) -> Iterator[bytes]:
+    """Paths that share a prefix spanning several 30 bytes long fork prefixes."""
+    prefix = "/".join(["a-very-long-shared-directory-name"] * 4)
+    for index in range(size):
+        yield f"{prefix}/{index:07d}".encode()
+
+
+def metadata_heavy_entries(size: int) -> Iterator[ManifestEntry]:
+    """Flat directory where every fork carries a few hundred bytes of metadata."""
+    for index, path in enumerate(flat_paths(size)):
+        yield (
+            path,
+            _entry(index),
+            {
+                "Content-Type": "application/octet-stream",
+                "Filename": path.decode(),
+                "X-Description": f"synthetic benchmark file number {index} " * 4,
+            },
+        )
+
+
+SHAPES: dict[str, Callable[[int], Iterator[ManifestEntry]]] = {
+    "flat": lambda size: ((path, _entry(index), None) for index, path in enumerate(flat_paths(size))),
+    "deep": lambda size: ((path, _entry(index), None) for index, path in enumerate(deep_paths(size))),
+    "long_prefix": lambda size: ((path, _entry(index), None) for index, path in enumerate(long_prefix_paths(size))),
+    "metadata_heavy": metadata_heavy_entries,
+}
+
+
+class ChunkStore:
+    """
+    Content addressed chunk store in memory.
+
+    Chunks are addressed by their keccak256 hash instead of the BMT hash of Bee, so the benchmarks
+    measure the manifest code instead of the hashing of the storage.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: dict[bytes, bytes] = {}
+
+    def save(self, data: bytes) -> Reference:
+        reference = keccak(data)
+        self.chunks[reference] = bytes(data)
+        return reference
+
+    def load(self, reference: Reference) -> bytes:
+        return self.chunks[bytes(reference)]
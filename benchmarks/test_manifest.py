@@ -0,0 +1,128 @@
+"""
+Benchmarks of building, changing, serialising, deserialising, saving and loading manifests.
+
+Run with:
+
+    hatch run bench:bench
+
+The results are saved into `.benchmarks/`, compare them with an earlier run with:
+
+    hatch run bench:compare 0001 0002
+"""
+
+from typing import Any
+
+import pytest
+from manifests import ChunkStore
+
+from mantaray_py import ManifestEntry, MantarayNode, Reference, load_all_nodes
+
+
+def _loaded_nodes(store: ChunkStore, reference: Reference) -> list[MantarayNode]:
+    node = MantarayNode()
+    node.load(store.load, reference)
+    load_all_nodes(store.load, node)
+
+    nodes = [node]
+    for node in nodes:
+        nodes.extend(fork.node for fork in (node.forks or {}).values())
+    return nodes
+
+
+@pytest.mark.benchmark(group="add_fork")
+def test_add_fork(benchmark: Any, entries: list[ManifestEntry], rounds: int) -> None:
+    def build() -> MantarayNode:
+        node = MantarayNode()
+        for path, entry, metadata in entries:
+            node.add_fork(path, entry, metadata)
+        return node
+
+    node = benchmark.pedantic(build, rounds=rounds)
+    assert node.forks
+
+
+@pytest.mark.benchmark(group="from_entries")
+def test_from_entries(benchmark: Any, entries: list[ManifestEntry], rounds: int) -> None:
+    node = benchmark.pedantic(MantarayNode.from_entries, args=(entries,), kwargs={"presorted": True}, rounds=rounds)
+    assert node.forks
+
+
+@pytest.mark.benchmark(group="apply")
+def test_apply(benchmark: Any, entries: list[ManifestEntry], rounds: int) -> None:
+    # * a delta that changes every 10th entry and removes every 10th other entry
+    changes = [(path, entry[::-1], metadata) for path, entry, metadata in entries[::10]]
+    changes += [(path, None, None) for path, _, _ in entries[5::10]]
+
+    def setup() -> tuple[tuple[MantarayNode], dict]:
+        return (MantarayNode.from_entries(entries, presorted=True),), {}
+
+    def apply(node: MantarayNode) -> MantarayNode:
+        node.apply(changes)
+        return node
+
+    assert benchmark.pedantic(apply, setup=setup, rounds=rounds).is_dirty()
+
+
+@pytest.mark.benchmark(group="serialise")
+def test_serialise(benchmark: Any, saved_manifest: tuple[ChunkStore, Reference], rounds: int) -> None:
+    store, reference = saved_manifest
+    nodes = _loaded_nodes(store, reference)
+
+    def serialise() -> list[bytes]:
+        return [node.serialise() for node in nodes]
+
+    assert len(benchmark.pedantic(serialise, rounds=rounds)) == len(store.chunks)
+
+
+@pytest.mark.benchmark(group="deserialise")
+def test_deserialise(benchmark: Any, saved_manifest: tuple[ChunkStore, Reference], rounds: int) -> None:
+    store, _ = saved_manifest
+    chunks = list(store.chunks.values())
+
+    def deserialise() -> None:
+        for data in chunks:
+            MantarayNode().deserialise(data)
+
+    benchmark.pedantic(deserialise, rounds=rounds)
+
+
+@pytest.mark.benchmark(group="save")
+def test_save(
+    benchmark: Any, entries: list[ManifestEntry], saved_manifest: tuple[ChunkStore, Reference], rounds: int
+) -> None:
+    store = ChunkStore()
+
+    def setup() -> tuple[tuple[MantarayNode], dict]:
+        return (MantarayNode.from_entries(entries, presorted=True),), {}
+
+    def save(node: MantarayNode) -> Reference:
+        return node.save(store.save)
+
+    assert benchmark.pedantic(save, setup=setup, rounds=rounds) == saved_manifest[1]
+
+
+@pytest.mark.benchmark(group="load_all_nodes")
+def test_load_all_nodes(benchmark: Any, saved_manifest: tuple[ChunkStore, Reference], rounds: int) -> None:
+    store, reference = saved_manifest
+
+    def load() -> MantarayNode:
+        node = MantarayNode()
+        node.load(store.load, reference)
+        load_all_nodes(store.load, node)
+        return node
+
+    assert benchmark.pedantic(load, rounds=rounds).forks
+
+
+@pytest.mark.benchmark(group="iter_entries")
+def test_iter_entries(
+    benchmark: Any, entries: list[ManifestEntry], saved_manifest: tuple[ChunkStore, Reference], rounds: int
+) -> None:
+    store, reference = saved_manifest
+
+    def iterate() -> int:
+        node = MantarayNode()
+        node.load(store.load, reference)
+        return sum(1 for _ in node.iter_entries())
+
+    assert benchmark.pedantic(iterate, rounds=rounds) == len(entries)
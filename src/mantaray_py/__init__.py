@@ -1,13 +1,35 @@
 """Mantaray data structure in Python"""
 
-from importlib.metadata import PackageNotFoundError, version
-from typing import Optional
+from typing import Any, Optional
 
-from rich.traceback import install
-
-from mantaray_py.node import MantarayFork, MantarayNode, check_for_separator, equal_nodes, load_all_nodes
+from mantaray_py.bmt import chunk_address, file_address, file_addresses
+from mantaray_py.builder import StreamingManifestBuilder
+from mantaray_py.metrics import ManifestMetrics, register_observer, unregister_observer
+from mantaray_py.node import (
+    ManifestDiff,
+    ManifestListing,
+    MantarayFork,
+    MantarayNode,
+    async_load_all_nodes,
+    check_for_separator,
+    diff,
+    equal_nodes,
+    load_all_nodes,
+)
+from mantaray_py.storage import (
+    CachingStorageLoader,
+    DiskCachingStorageLoader,
+    FileSystemStorageHandler,
+    InMemoryStorageHandler,
+)
 from mantaray_py.types.types import (
+    AsyncStorageLoader,
+    AsyncStorageSaver,
+    BatchStorageSaver,
+    ManifestChange,
+    ManifestEntry,
     MetadataMapping,
+    MetricsObserver,
     NodeType,
     Reference,
     StorageLoader,
@@ -17,7 +39,9 @@ from mantaray_py.types.types import (
 from mantaray_py.utils import (
     check_reference,
     common,
+    common_prefix_length,
     encrypt_decrypt,
+    encrypt_decrypt_into,
     equal_bytes,
     find_index_of_array,
     flatten_bytes_array,
@@ -26,31 +50,51 @@ from mantaray_py.utils import (
 )
 
 __all__ = [
+    "AsyncStorageLoader",
+    "AsyncStorageSaver",
+    "BatchStorageSaver",
+    "CachingStorageLoader",
+    "DiskCachingStorageLoader",
+    "FileSystemStorageHandler",
+    "InMemoryStorageHandler",
+    "ManifestChange",
+    "ManifestDiff",
+    "ManifestEntry",
+    "ManifestListing",
+    "ManifestMetrics",
     "MantarayFork",
     "MantarayNode",
     "MetadataMapping",
+    "MetricsObserver",
     "NodeType",
     "Reference",
     "StorageLoader",
     "StorageSaver",
+    "StreamingManifestBuilder",
+    "async_load_all_nodes",
     "check_for_separator",
     "check_reference",
+    "chunk_address",
     "common",
+    "common_prefix_length",
+    "diff",
     "encrypt_decrypt",
+    "encrypt_decrypt_into",
     "equal_bytes",
     "equal_nodes",
+    "file_address",
+    "file_addresses",
     "find_index_of_array",
     "flatten_bytes_array",
     "gen_32_bytes",
     "keccak256_hash",
     "load_all_nodes",
     "marshal_version_values",
+    "register_observer",
+    "unregister_observer",
 ]
 
 
-install()
-
-
 def init_manifest_node(options: Optional[dict] = None) -> MantarayNode:
     """
     Initializes a MantarayNode with an optional obfuscation key.
@@ -72,9 +116,14 @@ def init_manifest_node(options: Optional[dict] = None) -> MantarayNode:
     return manifest_node
 
 
-try:
-    __version__ = version("mantaray-py")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "unknown"
-finally:
-    del version, PackageNotFoundError
+def __getattr__(name: str) -> Any:
+    # * the version is looked up on first access, importlib.metadata is slow to import
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version  # noqa: PLC0415
+
+        try:
+            return version("mantaray-py")
+        except PackageNotFoundError:  # pragma: no cover
+            return "unknown"
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,168 @@
+import os
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Optional, Union
+
+from eth_hash.auto import keccak
+
+from mantaray_py.types import Reference
+
+SEGMENT_SIZE = 32
+SPAN_SIZE = 8
+CHUNK_PAYLOAD_SIZE = 4096
+# * Number of references that fit into an intermediate chunk
+BRANCHES = CHUNK_PAYLOAD_SIZE // SEGMENT_SIZE
+# * Depth of the binary merkle tree over the segments of a chunk payload
+BMT_DEPTH = BRANCHES.bit_length() - 1
+
+
+# * Root hashes of all zero subtrees by their height, the zero padding of a payload is not hashed again.
+# * They are calculated on first use, so the keccak backend is not loaded on import
+@lru_cache
+def zero_hashes() -> tuple[bytes, ...]:
+    hashes = [bytes(SEGMENT_SIZE)]
+    for _ in range(BMT_DEPTH):
+        hashes.append(keccak(hashes[-1] + hashes[-1]))
+    return tuple(hashes)
+
+
+def make_span(length: int) -> bytes:
+    """
+    Serialises the number of bytes that a chunk spans as a little endian uint64.
+
+    Args:
+        length (int): The number of bytes of the file data under the chunk.
+
+    Returns:
+        bytes: The 8 bytes long span.
+    """
+    if length < 0:
+        msg = f"Span cannot be negative. Got: {length}"
+        raise ValueError(msg)
+    return length.to_bytes(SPAN_SIZE, "little")
+
+
+def bmt_hash(payload: bytes) -> bytes:
+    """
+    Calculates the Binary Merkle Tree root hash of a chunk payload.
+
+    The payload is zero padded to 4096 bytes and split into 32 bytes long segments, the pairs of
+    neighbour nodes are hashed with keccak256 level by level up to the root.
+
+    Args:
+        payload (bytes): The chunk payload, at most 4096 bytes long.
+
+    Returns:
+        bytes: The 32 bytes long root hash.
+    """
+    if len(payload) > CHUNK_PAYLOAD_SIZE:
+        msg = f"Chunk payload cannot be longer than {CHUNK_PAYLOAD_SIZE} bytes. Got: {len(payload)}"
+        raise ValueError(msg)
+
+    if not payload:
+        return zero_hashes()[BMT_DEPTH]
+
+    level = [payload[offset : offset + SEGMENT_SIZE] for offset in range(0, len(payload), SEGMENT_SIZE)]
+    level[-1] = level[-1].ljust(SEGMENT_SIZE, b"\x00")
+    padding = zero_hashes()
+    for height in range(BMT_DEPTH):
+        if len(level) % 2:
+            level.append(padding[height])
+        level = [keccak(level[index] + level[index + 1]) for index in range(0, len(level), 2)]
+    return level[0]
+
+
+def chunk_address(payload: bytes, span: Optional[int] = None) -> Reference:
+    """
+    Calculates the address of a content addressed chunk, the keccak256 hash of its span and BMT root hash.
+
+    Args:
+        payload (bytes): The chunk payload, at most 4096 bytes long.
+        span (Optional[int]): The number of file bytes under the chunk. Defaults to the payload length.
+
+    Returns:
+        Reference: The 32 bytes long chunk address.
+    """
+    return keccak(make_span(len(payload) if span is None else span) + bmt_hash(payload))
+
+
+def _pop_carrier_chunk(chunks: list[tuple[Reference, int]]) -> Optional[tuple[Reference, int]]:
+    # * the last chunk of a level is carried up unwrapped if it would be the only child of its parent
+    if len(chunks) > 1 and len(chunks) % BRANCHES == 1:
+        return chunks.pop()
+    return None
+
+
+def file_address(data: bytes) -> Reference:
+    """
+    Calculates the reference of a file the same way as Bee does when the data is uploaded.
+
+    The data is split into 4096 bytes long chunks, the addresses of every 128 chunks are put into an
+    intermediate chunk and so on until a single root chunk remains.
+
+    Args:
+        data (bytes): Content of the file.
+
+    Returns:
+        Reference: The address of the root chunk.
+    """
+    # * (address, span) of the chunks of the current level
+    level = [
+        (chunk_address(data[offset : offset + CHUNK_PAYLOAD_SIZE]), min(CHUNK_PAYLOAD_SIZE, len(data) - offset))
+        for offset in range(0, max(len(data), 1), CHUNK_PAYLOAD_SIZE)
+    ]
+    carrier_chunk = _pop_carrier_chunk(level)
+
+    while len(level) != 1 or carrier_chunk is not None:
+        next_level = []
+        for offset in range(0, len(level), BRANCHES):
+            children = level[offset : offset + BRANCHES]
+            span = sum(child_span for _, child_span in children)
+            next_level.append((chunk_address(b"".join(address for address, _ in children), span), span))
+
+        if carrier_chunk is None:
+            carrier_chunk = _pop_carrier_chunk(next_level)
+        elif len(next_level) % BRANCHES != 0:
+            next_level.append(carrier_chunk)
+            carrier_chunk = None
+        level = next_level
+
+    return level[0][0]
+
+
+def _file_address_of_path(path: Union[str, os.PathLike]) -> Reference:
+    with open(path, "rb") as file:
+        return file_address(file.read())
+
+
+def file_addresses(
+    paths: Iterable[Union[str, os.PathLike]],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> list[Reference]:
+    """
+    Calculates the references of files in parallel without uploading them.
+
+    Hashing is CPU bound, so by default the files are spread across a process pool.
+
+    Args:
+        paths (Iterable[Union[str, os.PathLike]]): Paths of the files.
+        max_workers (Optional[int]): Number of processes of the pool that is created when no `executor` is given.
+        executor (Optional[Executor]): Executor that hashes the files.
+
+    Returns:
+        list[Reference]: The references of the files in the order of `paths`.
+    """
+    paths = list(paths)
+    if executor is not None:
+        return list(executor.map(_file_address_of_path, paths))
+
+    # * the process pool pulls in multiprocessing, which is only imported once it is needed
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    max_workers = max_workers or os.cpu_count() or 1
+    # * small files are sent to the workers in batches to spare the inter-process round trips
+    chunksize = max(1, len(paths) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as process_pool:
+        return list(process_pool.map(_file_address_of_path, paths, chunksize=chunksize))
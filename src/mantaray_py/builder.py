@@ -0,0 +1,136 @@
+from collections.abc import Iterable
+from concurrent.futures import Executor, Future
+from typing import Optional
+
+from mantaray_py.node import MantarayNode
+from mantaray_py.types import ManifestEntry, MetadataMapping, Reference, StorageSaver
+from mantaray_py.utils import common_prefix_length
+
+
+class StreamingManifestBuilder:
+    """
+    Builds a manifest from `(path, entry, metadata)` tuples sorted by path and saves it while it is built.
+
+    A node is saved as soon as the added paths have moved past its subtree, then its forks are dropped.
+    Only the nodes along the last added path and their forks are kept in memory, so the memory use
+    depends on the depth and the fanout of the manifest instead of its number of entries. The saved
+    chunks and the returned reference are the same as the ones of `MantarayNode.from_entries` and `save`.
+
+    If an `executor` is given, the finished subtrees are saved on it while the next paths are added.
+    `storage_saver` has to be thread safe in that case.
+
+    Attributes:
+        storage_saver (StorageSaver): Saves a serialised node and returns its reference.
+        executor (Optional[Executor]): Runs the saves of the finished subtrees.
+        entry_count (int): Number of added entries.
+    """
+
+    def __init__(
+        self,
+        storage_saver: StorageSaver,
+        obfuscation_key: Optional[bytes] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.storage_saver = storage_saver
+        self.executor = executor
+        self.entry_count = 0
+        self.__root = MantarayNode()
+        if obfuscation_key is not None:
+            self.__root.set_obfuscation_key(obfuscation_key)
+        # * (node, depth, saves of its finished forks in flight) from the root to the node of the last path
+        self.__spine: list[tuple[MantarayNode, int, list[Future]]] = [(self.__root, 0, [])]
+        self.__last_path: Optional[bytes] = None
+        # * save of the last flushed subtree in flight, until it is attached to the spine
+        self.__pending: list[Future] = []
+
+    def add(self, path: bytes, entry: Reference, metadata: Optional[MetadataMapping] = None) -> None:
+        """
+        Adds an entry to the manifest.
+
+        Parameters:
+        - path (bytes): Path of the entry. It cannot be less than the path of the previously added entry.
+        - entry (Reference): The entry to be associated with the path.
+        - metadata (Optional[MetadataMapping]): Metadata of the entry.
+
+        Raises:
+        ValueError: If the paths are not added in sorted order.
+        """
+        common_length = 0
+        if self.__last_path is not None:
+            if path < self.__last_path:
+                msg = f"Paths have to be added in sorted order. Got {path!r} after {self.__last_path!r}"
+                raise ValueError(msg)
+            common_length = common_prefix_length(self.__last_path, path)
+
+        kept = self.__flush(common_length)
+        node, depth, _ = self.__spine[-1]
+        node.add_fork(path[depth:], entry, metadata)
+
+        while depth < len(path):
+            fork = node.forks[path[depth]]  # type: ignore
+            node = fork.node
+            depth += len(fork.prefix)
+            self.__spine.append((node, depth, []))
+
+        if self.__pending:
+            # * the flushed subtree hangs from the node at the common path, which may have just been split off
+            parent = self.__spine[kept - 1] if self.__spine[kept - 1][1] == common_length else self.__spine[kept]
+            parent[2].extend(self.__pending)
+            self.__pending = []
+
+        self.__last_path = path
+        self.entry_count += 1
+
+    def add_entries(self, entries: Iterable[ManifestEntry]) -> None:
+        """
+        Adds the `(path, entry, metadata)` tuples in order.
+        """
+        for path, entry, metadata in entries:
+            self.add(path, entry, metadata)
+
+    def finish(self) -> Reference:
+        """
+        Saves the rest of the manifest.
+
+        Returns:
+        - Reference: Reference of the root node.
+        """
+        self.__flush(0)
+        root_pending = self.__spine[0][2] + self.__pending
+        self.__spine[0][2].clear()
+        self.__pending = []
+        for future in root_pending:
+            future.result()
+        return self.__root.save(self.storage_saver)
+
+    def __flush(self, depth: int) -> int:
+        """
+        Saves the spine nodes deeper than `depth` and drops them from the spine.
+
+        Returns:
+        - int: Number of the kept spine nodes.
+        """
+        kept = len(self.__spine)
+        while self.__spine[kept - 1][1] > depth:
+            kept -= 1
+        if kept == len(self.__spine):
+            return kept
+
+        flushed = self.__spine[kept:]
+        del self.__spine[kept:]
+        # * the subtree can only be serialised once the saves of its own finished forks are done
+        for _, _, pending in flushed:
+            for future in pending:
+                future.result()
+
+        node = flushed[0][0]
+        if self.executor is None:
+            self.__save(node)
+        else:
+            self.__pending = [self.executor.submit(self.__save, node)]
+        return kept
+
+    def __save(self, node: MantarayNode) -> None:
+        node.save(self.storage_saver)
+        # * the parent only needs the type, metadata and reference of a saved node
+        node.forks = None
@@ -0,0 +1,179 @@
+import functools
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, TypeVar, cast
+
+from mantaray_py.types import MetricsObserver
+
+# * Events reported to the observers
+STORAGE_LOAD = "storage_load"
+STORAGE_SAVE = "storage_save"
+SERIALISE = "serialise"
+DESERIALISE = "deserialise"
+ENCRYPT_DECRYPT = "encrypt_decrypt"
+JSON = "json"
+
+# * Registered observers. The instrumented code only checks whether it is empty, so
+# * the instrumentation costs a single truthiness check while no observer is registered
+OBSERVERS: list[MetricsObserver] = []
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def register_observer(observer: MetricsObserver) -> None:
+    """
+    Registers an observer that is called with `(event, seconds, size)` after every instrumented operation.
+
+    The observers are called from the thread that ran the operation, so they have to be thread safe
+    if nodes are loaded or saved on several threads.
+
+    Args:
+        observer (MetricsObserver): Callable that receives the event name, its duration and the processed bytes.
+    """
+    OBSERVERS.append(observer)
+
+
+def unregister_observer(observer: MetricsObserver) -> None:
+    """
+    Removes a registered observer.
+
+    Raises:
+        ValueError: If the observer is not registered.
+    """
+    OBSERVERS.remove(observer)
+
+
+@contextmanager
+def observe(observer: MetricsObserver) -> Generator[MetricsObserver, None, None]:
+    """
+    Registers an observer for the duration of the `with` block.
+    """
+    register_observer(observer)
+    try:
+        yield observer
+    finally:
+        unregister_observer(observer)
+
+
+def notify(event: str, seconds: float, size: int) -> None:
+    """
+    Reports an event to the registered observers.
+    """
+    for observer in OBSERVERS:
+        observer(event, seconds, size)
+
+
+def timed(event: str, size: Callable[[Any, tuple], int]) -> Callable[[F], F]:
+    """
+    Decorator that reports every call of the decorated function as `event`.
+
+    Args:
+        event (str): Name of the reported event.
+        size (Callable): Returns the number of processed bytes from the result and the arguments of a call.
+    """
+
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not OBSERVERS:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            result = function(*args, **kwargs)
+            notify(event, perf_counter() - start, size(result, args))
+            return result
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+class EventMetrics:
+    """
+    Aggregated measurements of an event.
+
+    Attributes:
+        calls (int): Number of reported events.
+        bytes (int): Summed size of the processed data in bytes.
+        seconds (float): Summed duration of the events.
+        max_seconds (float): Duration of the slowest event.
+    """
+
+    __slots__ = ("bytes", "calls", "max_seconds", "seconds")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"EventMetrics(calls={self.calls}, bytes={self.bytes}, "
+            f"seconds={self.seconds:.6f}, max_seconds={self.max_seconds:.6f})"
+        )
+
+    @property
+    def mean_seconds(self) -> float:
+        """
+        Mean duration of an event.
+        """
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+class ManifestMetrics:
+    """
+    An observer that aggregates the instrumented operations by event.
+
+    Storage events are reported per `StorageLoader` and `StorageSaver` call with the size of the loaded
+    or saved chunk. `serialise` and `deserialise` are reported per node. The durations are inclusive,
+    the time of `deserialise` contains the `encrypt_decrypt` and `json` time of the same node.
+
+    Usage:
+        metrics = ManifestMetrics()
+        with metrics.observe():
+            node.load(storage_loader, reference)
+        print(metrics[STORAGE_LOAD].calls, metrics[STORAGE_LOAD].mean_seconds)
+
+    Attributes:
+        events (dict[str, EventMetrics]): Measurements by event name.
+    """
+
+    def __init__(self) -> None:
+        self.events: dict[str, EventMetrics] = {}
+        self.__lock = threading.Lock()
+
+    def __call__(self, event: str, seconds: float, size: int) -> None:
+        with self.__lock:
+            metrics = self.events.get(event)
+            if metrics is None:
+                metrics = self.events[event] = EventMetrics()
+            metrics.calls += 1
+            metrics.bytes += size
+            metrics.seconds += seconds
+            metrics.max_seconds = max(metrics.max_seconds, seconds)
+
+    def __getitem__(self, event: str) -> EventMetrics:
+        """
+        Returns the measurements of an event, all zero if it has not been reported.
+        """
+        return self.events.get(event) or EventMetrics()
+
+    def __repr__(self) -> str:
+        return f"ManifestMetrics({self.events})"
+
+    @contextmanager
+    def observe(self) -> Generator["ManifestMetrics", None, None]:
+        """
+        Collects the events of the `with` block.
+        """
+        with observe(self):
+            yield self
+
+    def reset(self) -> None:
+        """
+        Drops the collected measurements.
+        """
+        with self.__lock:
+            self.events = {}
@@ -1,12 +1,21 @@
 import json
-from typing import Any, Optional, Union
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional, TypedDict, Union
 
-from eth_utils import keccak
-from pydantic import BaseModel, ConfigDict
-from rich.console import Console
-from rich.traceback import install
+from eth_hash.auto import keccak
 
+from mantaray_py.metrics import DESERIALISE, JSON, OBSERVERS, SERIALISE, STORAGE_LOAD, STORAGE_SAVE, notify, timed
 from mantaray_py.types import (
+    AsyncStorageLoader,
+    AsyncStorageSaver,
+    BatchStorageSaver,
+    ManifestChange,
+    ManifestEntry,
     MarshalVersion,
     MetadataMapping,
     NodeType,
@@ -14,21 +23,192 @@ from mantaray_py.types import (
     StorageLoader,
     StorageSaver,
 )
-from mantaray_py.utils import IndexBytes, check_reference, common, encrypt_decrypt, equal_bytes, flatten_bytes_array
+from mantaray_py.utils import (
+    IndexBytes,
+    check_reference,
+    common,
+    common_prefix_length,
+    encrypt_decrypt,
+    equal_bytes,
+    flatten_bytes_array,
+)
+
+if TYPE_CHECKING:
+    import asyncio
 
-install()
-console = Console()
+logger = logging.getLogger(__name__)
 
 PATH_SEPARATOR = b"/"
 PATH_SEPARATOR_BYTE = 47
 PADDING_BYTE = 0x0A
 NODE_SIZE = 255
+# * Default number of storage calls that the async load and save methods keep in flight
+MAX_CONCURRENCY = 32
+
+
+class ForkMapping(dict[int, Any]):
+    """
+    Forks of a node by the first byte of their prefix. Setting or removing a fork links the node of the set
+    fork to the owner node and makes the owner dirty.
+    """
+
+    __slots__ = ("__owner",)
+
+    def __init__(self, owner: "MantarayNode", forks: Any = ()) -> None:
+        super().__init__(forks)
+        # * the owner itself is kept, a bound method per node would double the allocations of a load
+        self.__owner = owner
+
+    def __changed(self, fork: Optional["MantarayFork"]) -> None:
+        self.__owner._on_forks_change(fork)
+
+    def __setitem__(self, key: int, fork: "MantarayFork") -> None:
+        super().__setitem__(key, fork)
+        self.__changed(fork)
+
+    def __delitem__(self, key: int) -> None:
+        super().__delitem__(key)
+        self.__changed(None)
 
+    def __ior__(self, forks: Any) -> "ForkMapping":  # type: ignore[override,misc]
+        self.update(forks)
+        return self
 
-ForkMapping = dict
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, fork in dict(*args, **kwargs).items():
+            self[key] = fork
 
+    def setdefault(self, key: int, fork: Any = None) -> Any:
+        if key not in self:
+            self[key] = fork
+        return self[key]
 
-class MantarayFork(BaseModel):
+    def pop(self, key: int, *default: Any) -> Any:
+        if key in self:
+            fork = super().pop(key)
+            self.__changed(None)
+            return fork
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[int, "MantarayFork"]:
+        item = super().popitem()
+        self.__changed(None)
+        return item
+
+    def clear(self) -> None:
+        if self:
+            super().clear()
+            self.__changed(None)
+
+
+class RecursiveSaveReturnType(TypedDict):
+    reference: Reference
+    changed: bool
+
+
+class ManifestDiff(NamedTuple):
+    """
+    Paths that differ between two manifests, each list in lexicographic order.
+
+    Attributes:
+        added (list[bytes]): Paths that are only in the second manifest.
+        removed (list[bytes]): Paths that are only in the first manifest.
+        changed (list[bytes]): Paths that are in both manifests with a different entry or metadata.
+    """
+
+    added: list[bytes]
+    removed: list[bytes]
+    changed: list[bytes]
+
+
+class ManifestListing(NamedTuple):
+    """
+    A page of `MantarayNode.list`.
+
+    Attributes:
+        entries (list[ManifestEntry]): `(path, entry, metadata)` of the listed entries.
+        common_prefixes (list[bytes]): The listed paths that the delimiter rolled up, each ending with the delimiter.
+        next_start_after (Optional[bytes]): `start_after` of the next page, None if there are no more entries.
+    """
+
+    entries: list[ManifestEntry]
+    common_prefixes: list[bytes]
+    next_start_after: Optional[bytes]
+
+
+# * json handling of the metadata is reported to the observers of mantaray_py.metrics
+@timed(JSON, lambda _, args: len(args[0]))
+def json_loads(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+
+@timed(JSON, lambda result, _: len(result))
+def json_dumps(data: Any) -> str:
+    return json.dumps(data)
+
+
+def load_chunk(storage_loader: StorageLoader, reference: Reference) -> bytes:
+    """
+    Calls the storage loader and reports the call to the observers of mantaray_py.metrics.
+    """
+    if not OBSERVERS:
+        return storage_loader(reference)
+    start = perf_counter()
+    data = storage_loader(reference)
+    notify(STORAGE_LOAD, perf_counter() - start, len(data))
+    return data
+
+
+def save_chunk(storage_saver: StorageSaver, data: bytes) -> Reference:
+    """
+    Calls the storage saver and reports the call to the observers of mantaray_py.metrics.
+    """
+    if not OBSERVERS:
+        reference: Reference = storage_saver(data)
+        return reference
+    start = perf_counter()
+    reference = storage_saver(data)
+    notify(STORAGE_SAVE, perf_counter() - start, len(data))
+    return reference
+
+
+def save_chunks(batch_storage_saver: BatchStorageSaver, chunks: list[bytes]) -> list[Reference]:
+    """
+    Calls the batch storage saver and reports the call to the observers of mantaray_py.metrics.
+    """
+    if not OBSERVERS:
+        return batch_storage_saver(chunks)
+    start = perf_counter()
+    references = batch_storage_saver(chunks)
+    notify(STORAGE_SAVE, perf_counter() - start, sum(len(data) for data in chunks))
+    return references
+
+
+async def async_load_chunk(storage_loader: AsyncStorageLoader, reference: Reference) -> bytes:
+    """
+    Awaits the storage loader and reports the call to the observers of mantaray_py.metrics.
+    """
+    if not OBSERVERS:
+        return await storage_loader(reference)
+    start = perf_counter()
+    data = await storage_loader(reference)
+    notify(STORAGE_LOAD, perf_counter() - start, len(data))
+    return data
+
+
+async def async_save_chunk(storage_saver: AsyncStorageSaver, data: bytes) -> Reference:
+    """
+    Awaits the storage saver and reports the call to the observers of mantaray_py.metrics.
+    """
+    if not OBSERVERS:
+        return await storage_saver(data)
+    start = perf_counter()
+    reference = await storage_saver(data)
+    notify(STORAGE_SAVE, perf_counter() - start, len(data))
+    return reference
+
+
+class MantarayFork:
     """
     A class used to represent a Mantaray Fork.
 
@@ -37,28 +217,41 @@ class MantarayFork(BaseModel):
         node (MantarayNode): In memory structure that represents the Node.
     """
 
-    prefix: bytes
-    node: "MantarayNode"
+    __slots__ = ("__prefix", "node")
+
+    def __init__(self, prefix: Union[bytes, memoryview], node: "MantarayNode") -> None:
+        self.__prefix = prefix
+        self.node = node
+
+    @property
+    def prefix(self) -> bytes:
+        # * a deserialised fork holds a view of the loaded chunk until the prefix is first read
+        prefix = self.__prefix
+        if type(prefix) is not bytes:
+            prefix = self.__prefix = bytes(prefix)
+        return prefix
+
+    @prefix.setter
+    def prefix(self, prefix: bytes) -> None:
+        self.__prefix = prefix
+
+    def __repr__(self) -> str:
+        return f"MantarayFork(prefix={self.prefix!r}, node={self.node!r})"
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, MantarayFork):
             return False
         return self.prefix == other.prefix and self.node == other.node
 
-    def __hash__(self) -> int:
-        """
-        A class that implements __eq__ but not __hash__ will have its hash method implicitly set
-        to None. This will cause the class to be unhashable, will in turn cause issues when
-        using the class as a key in a dictionary or a member of a set.
-        * https://docs.astral.sh/ruff/rules/eq-without-hash/
-        """
-        return hash(self.node)
+    # * forks are mutable and compared by their content, so they are explicitly unhashable
+    # * https://docs.astral.sh/ruff/rules/eq-without-hash/
+    __hash__ = None  # type: ignore[assignment]
 
     @staticmethod
     def __create_metadata_padding(metadata_size_with_size: int) -> bytes:
         # can be done as bytes(0) as well
         padding: bytes = b""
-        node_headers_sizes: NodeHeaderSizes = NodeHeaderSizes()
+        node_headers_sizes = NODE_HEADER_SIZES
 
         if metadata_size_with_size < node_headers_sizes.obfuscation_key:
             padding_len = node_headers_sizes.obfuscation_key - metadata_size_with_size
@@ -75,7 +268,7 @@ class MantarayFork(BaseModel):
         node_type = self.node.get_type()
         # * Bytes of len 1 & in big endian. Have to specify for python <= 3.10
         prefix_len_bytes: bytes = len(self.prefix).to_bytes(1, "big")
-        node_fork_sizes: NodeForkSizes = NodeForkSizes()
+        node_fork_sizes = NODE_FORK_SIZES
 
         prefix_bytes = bytearray(node_fork_sizes.prefix_max_size)
         prefix_bytes[: len(self.prefix)] = self.prefix
@@ -89,8 +282,12 @@ class MantarayFork(BaseModel):
         data = bytes([node_type]) + prefix_len_bytes + prefix_bytes + entry
 
         if self.node.is_with_metadata_type():
+            serialised_metadata = self.node.get_serialised_metadata()
+            if serialised_metadata is not None:
+                return data + len(serialised_metadata).to_bytes(2, byteorder="big") + serialised_metadata
+
             # console.log(json.dumps(self.node.get_metadata()).replace(' ', ''))
-            json_string = json.dumps(self.node.get_metadata()).replace(" ", "")
+            json_string = json_dumps(self.node.get_metadata()).replace(" ", "")
             # * the uploaded data returned by the bee is very odd. All white spaces are removed from dictionary key pars
             # * but the spaces after a `;` is kept as it is. So this is a hacky wat to fix this issue.
             # * First remove all white spaces then replace the `;` with a `;` and a spaced followed by ;)
@@ -109,11 +306,18 @@ class MantarayFork(BaseModel):
 
     @classmethod
     def deserialise(
-        cls, data: bytes, obfuscation_key: bytes, options: Optional[dict[str, dict[str, int]]] = None
+        cls,
+        data: Union[bytes, memoryview],
+        obfuscation_key: bytes,
+        options: Optional[dict[str, dict[str, int]]] = None,
     ) -> "MantarayFork":
+        """
+        Deserialises a fork. If `data` is a memoryview, the prefix and the entry are kept as views of it
+        and copied to bytes only when they are read.
+        """
         node_type = data[0]
         prefix_length = data[1]
-        node_fork_sizes: NodeForkSizes = NodeForkSizes()
+        node_fork_sizes = NODE_FORK_SIZES
 
         if prefix_length == 0 or prefix_length > node_fork_sizes.prefix_max_size:
             msg = f"Prefix length of fork is greater than {node_fork_sizes.prefix_max_size}. Got: {prefix_length}"
@@ -138,8 +342,8 @@ class MantarayFork(BaseModel):
                 start_metadata = entry_end + node_fork_sizes.metadata
                 metadata_bytes = data[start_metadata : start_metadata + metadata_byte_size]
 
-                json_string = metadata_bytes.decode("utf-8")
-                node.set_metadata(json.loads(json_string))
+                # * decoded only when it is read
+                node.set_metadata(bytes(metadata_bytes))
         else:
             entry_start = node_fork_sizes.pre_reference
             node.set_entry(data[entry_start:])
@@ -153,56 +357,125 @@ class MantarayFork(BaseModel):
         return cls(prefix=prefix, node=node)
 
 
-class MantarayNode(BaseModel):
-    # * Used with NodeType type
-    __type: Optional[int] = None
-    __obfuscation_key: Optional[bytes] = None
-    # * reference of a loaded manifest node. if undefined i.e. None, the node can be handled as `dirty`
-    __content_address: Optional[Reference] = None
-    # * reference of an content that the manifest refers to
-    __entry: Optional[Reference] = None
-    __metadata: Optional[MetadataMapping] = None
-    # * Forks of the manifest. Has to be initialized with `{}` on load even if there were no forks
-    forks: Optional[ForkMapping] = None
+class MantarayNode:
+    __slots__ = (
+        "__content_address",
+        "__entry",
+        "__forks",
+        "__metadata",
+        "__obfuscation_key",
+        "__parent",
+        "__storage_loader",
+        "__type",
+    )
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    def __init__(self) -> None:
+        # * Used with NodeType type
+        self.__type: Optional[int] = None
+        self.__obfuscation_key: Optional[bytes] = None
+        # * reference of a loaded manifest node. if undefined i.e. None, the node can be handled as `dirty`
+        self.__content_address: Optional[Reference] = None
+        # * reference of an content that the manifest refers to
+        self.__entry: Optional[Union[Reference, memoryview]] = None
+        # * MetadataMapping or its serialised JSON bytes if it has not been decoded yet
+        self.__metadata: Optional[Union[MetadataMapping, bytes]] = None
+        # * loader of a fork node that has been deserialised only as a reference. Its chunk is fetched on first
+        # * traversal
+        self.__storage_loader: Optional[StorageLoader] = None
+        # * Forks of the manifest. Has to be initialized with `{}` on load even if there were no forks
+        self.__forks: Optional[ForkMapping] = None
+        # * node that has this node as a fork, the changes of this node make it dirty as well
+        self.__parent: Optional[MantarayNode] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"MantarayNode(type={self.__type!r}, entry={self.get_entry()!r}, metadata={self.get_metadata()!r}, "
+            f"content_address={self.__content_address!r}, forks={self.forks!r})"
+        )
 
     def __eq__(self, other: Any) -> bool:
+        """
+        Compares the entry, the obfuscation key and the forks of the nodes, with the type and the metadata
+        of the fork nodes, recursively. Unresolved forks of loaded manifests are fetched for the comparison.
+        """
         if not isinstance(other, MantarayNode):
             return False
 
-        # Check if forks are the same length
-        if len(self.forks) != len(other.forks):  # type: ignore
+        # * saved or loaded nodes with the same chunk have the same subtree
+        if self.__content_address is not None and self.__content_address == other.__content_address:
+            return True
+
+        node, other_node = self.__loaded_view(), other.__loaded_view()
+        # * an edge node has no entry, a loaded one has a zero reference in its place
+        entry, other_entry = node.get_entry(), other_node.get_entry()
+        if (entry if entry and any(entry) else None) != (other_entry if other_entry and any(other_entry) else None):
+            return False
+        # * serialise writes a zero obfuscation key if the node has none
+        if (node.__obfuscation_key or bytes(32)) != (other_node.__obfuscation_key or bytes(32)):
             return False
 
-        # Compare each fork
-        for key in self.forks:  # type: ignore
-            if key not in other.forks:  # type: ignore
-                return False
-            if self.forks[key] != other.forks[key]:  # type: ignore
+        forks: dict[int, MantarayFork] = node.forks or {}
+        other_forks: dict[int, MantarayFork] = other_node.forks or {}
+        if len(forks) != len(other_forks):
+            return False
+        for key, fork in forks.items():
+            other_fork = other_forks.get(key)
+            # * the type and the metadata of a node are stored in the fork of its parent
+            if (
+                other_fork is None
+                or fork.prefix != other_fork.prefix
+                or fork.node.__type != other_fork.node.__type
+                or (fork.node.get_metadata() or None) != (other_fork.node.get_metadata() or None)
+                or fork.node != other_fork.node
+            ):
                 return False
 
         return True
 
-    def __hash__(self) -> int:
+    # * nodes are mutable and compared by their content, so they are explicitly unhashable
+    # * https://docs.astral.sh/ruff/rules/eq-without-hash/
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def forks(self) -> Optional[ForkMapping]:
+        return self.__forks
+
+    @forks.setter
+    def forks(self, forks: Optional[dict[int, MantarayFork]]) -> None:
+        if forks is None:
+            self.__forks = None
+            return
+        self.__forks = ForkMapping(self, forks)
+        for fork in forks.values():
+            fork.node.__parent = self
+        if forks:
+            self.make_dirty()
+
+    def _on_forks_change(self, fork: Optional[MantarayFork]) -> None:
         """
-        A class that implements __eq__ but not __hash__ will have its hash method implicitly set
-        to None. This will cause the class to be unhashable, will in turn cause issues when
-        using the class as a key in a dictionary or a member of a set.
-        * https://docs.astral.sh/ruff/rules/eq-without-hash/
+        Called by ForkMapping. Links the node of a fork that has been set in the forks of this node, and makes
+        this node dirty.
         """
-        return hash(self.forks)
+        if fork is not None:
+            fork.node.__parent = self
+        self.make_dirty()
 
     def set_content_address(self, content_address: Reference) -> None:
         check_reference(content_address)
         self.__content_address = content_address
 
-    def set_entry(self, entry: Reference) -> None:
+    def set_entry(self, entry: Union[Reference, memoryview]) -> None:
+        # * an unresolved node is loaded first, otherwise its chunk would overwrite the change on a later
+        # * traversal and save would write it without its forks
+        self.__resolve()
+        self.__set_entry(entry)
+        self.make_dirty()
+
+    def __set_entry(self, entry: Union[Reference, memoryview]) -> None:
         check_reference(entry)
         self.__entry = entry
-        if not equal_bytes(entry, bytes(len(entry))):
+        if any(entry):
             self.__make_value()
-        self.make_dirty()
 
     def set_type(self, _type: int) -> None:
         if _type > NODE_SIZE:
@@ -217,13 +490,26 @@ class MantarayNode(BaseModel):
         if len(obfuscation_key) != 32:  # noqa: PLR2004
             msg = "Wrong obfuscation_key length. Entry can only be 32 bytes in length"
             raise ValueError(msg)
+        self.__resolve()
         self.__obfuscation_key = obfuscation_key
         self.make_dirty()
 
-    def set_metadata(self, metadata: MetadataMapping) -> None:
+    def set_metadata(self, metadata: Union[MetadataMapping, bytes]) -> None:
+        """
+        Sets the metadata of the node. It can also be given as serialised JSON bytes, those are decoded
+        on the first `get_metadata` call and written back as they are by `serialise` until then.
+        """
+        self.__resolve()
+        # * only the website keys make the node a value type, other metadata is kept serialised
+        if isinstance(metadata, bytes) and (
+            b'"website-index-document"' in metadata or b'"website-error-document"' in metadata
+        ):
+            metadata = json_loads(metadata)
         self.__metadata = metadata
         self.__make_with_metadata()
-        if metadata.get("website-index-document") or metadata.get("website-error-document"):
+        if isinstance(metadata, dict) and (
+            metadata.get("website-index-document") or metadata.get("website-error-document")
+        ):
             self.__make_value()
         self.make_dirty()
 
@@ -231,13 +517,28 @@ class MantarayNode(BaseModel):
         return self.__obfuscation_key
 
     def get_entry(self) -> Optional[Reference]:
-        return self.__entry
+        entry = self.__entry
+        if entry is not None and type(entry) is not bytes:
+            entry = self.__entry = bytes(entry)
+        return entry
 
     def get_content_address(self) -> Optional[Reference]:
         return self.__content_address
 
     def get_metadata(self) -> Optional[MetadataMapping]:
-        return self.__metadata
+        metadata = self.__metadata
+        if type(metadata) is bytes:
+            # * the returned mapping can be modified, so the serialised form is dropped
+            metadata = self.__metadata = json_loads(metadata)
+        return metadata  # type: ignore
+
+    def get_serialised_metadata(self) -> Optional[bytes]:
+        """
+        Returns the metadata bytes as they were loaded from storage including their padding,
+        or None if the metadata has been decoded or set as a mapping since.
+        """
+        metadata = self.__metadata
+        return metadata if type(metadata) is bytes else None
 
     def get_type(self) -> int:
         if self.__type is None:
@@ -301,6 +602,12 @@ class MantarayNode(BaseModel):
         else:
             self.__make_not_with_path_separator()
 
+    def __attach(self, prefix: bytes, node: "MantarayNode") -> None:
+        """
+        Sets `node` as the fork of `prefix`.
+        """
+        self.forks[prefix[0]] = MantarayFork(prefix=prefix, node=node)  # type: ignore
+
     # ? BL methods
 
     def add_fork(self, path: bytes, entry: Reference, metadata: Optional[MetadataMapping] = None) -> None:
@@ -320,6 +627,8 @@ class MantarayNode(BaseModel):
         if metadata is None:
             metadata = {}
 
+        self.__resolve()
+
         if len(path) == 0:
             self.set_entry(entry)
             if metadata:
@@ -341,14 +650,14 @@ class MantarayNode(BaseModel):
             if self.__obfuscation_key:
                 new_node.set_obfuscation_key(self.__obfuscation_key)
 
-            node_fork_sizes: NodeForkSizes = NodeForkSizes()
+            node_fork_sizes = NODE_FORK_SIZES
             # * check for prefix size limit
             if len(path) > node_fork_sizes.prefix_max_size:
                 prefix = path[: node_fork_sizes.prefix_max_size]
                 rest = path[node_fork_sizes.prefix_max_size :]
                 new_node.add_fork(rest, entry, metadata)
                 new_node.__update_with_path_separator(prefix)
-                self.forks[path[0]] = MantarayFork(prefix=prefix, node=new_node)
+                self.__attach(prefix, new_node)
                 self.make_dirty()
                 self.__make_edge()
                 return
@@ -358,7 +667,7 @@ class MantarayNode(BaseModel):
                 new_node.set_metadata(metadata)
 
             new_node.__update_with_path_separator(path)
-            self.forks[path[0]] = MantarayFork(prefix=path, node=new_node)
+            self.__attach(path, new_node)
             self.make_dirty()
             self.__make_edge()
             return
@@ -372,7 +681,8 @@ class MantarayNode(BaseModel):
             new_node = MantarayNode()
             new_node.set_obfuscation_key(self.__obfuscation_key or bytes(32))
             fork.node.__update_with_path_separator(rest_path)
-            new_node.forks = {rest_path[0]: MantarayFork(prefix=rest_path, node=fork.node)}
+            new_node.forks = {}
+            new_node.__attach(rest_path, fork.node)
             new_node.__make_edge()
 
             # * if common path is full path new node is value type
@@ -388,10 +698,126 @@ class MantarayNode(BaseModel):
         # * newNode's prefix is a subset of the given `path`, here the desired fork will be added with the
         # * truncated path
         new_node.add_fork(path[len(common_path) :], entry, metadata)
-        self.forks[path[0]] = MantarayFork(prefix=common_path, node=new_node)
+        self.__attach(common_path, new_node)
         self.__make_edge()
         self.make_dirty()
 
+    @classmethod
+    def from_entries(
+        cls,
+        entries: Iterable[ManifestEntry],
+        obfuscation_key: Optional[bytes] = None,
+        *,
+        presorted: bool = False,
+    ) -> "MantarayNode":
+        """
+        Builds a manifest from `(path, entry, metadata)` tuples in one pass.
+
+        The result serialises byte by byte the same as calling `add_fork` with the entries in path
+        order, but every node is created at its final place and no fork is split later.
+        Entries with the same path are applied in their input order.
+
+        Parameters:
+        - entries (Iterable[ManifestEntry]): The entries of the manifest.
+        - obfuscation_key (Optional[bytes]): The obfuscation key of the nodes.
+        - presorted (bool): Whether `entries` are already sorted by path. Sorting is skipped then.
+
+        Returns:
+        MantarayNode: The root node of the manifest.
+
+        Raises:
+        ValueError: If `presorted` is set but the entries are not sorted by path.
+        """
+        if presorted:
+            entries = list(entries)
+        else:
+            entries = sorted(entries, key=itemgetter(0))
+
+        # * length of the common prefix of each path with the previous one
+        common_lengths = [0] * len(entries)
+        for index in range(1, len(entries)):
+            previous_path, path = entries[index - 1][0], entries[index][0]
+            if path < previous_path:
+                msg = f"Entries are not sorted by path at index {index}: {previous_path!r} > {path!r}"
+                raise ValueError(msg)
+            common_lengths[index] = common_prefix_length(previous_path, path)
+
+        root = cls()
+        if obfuscation_key is not None:
+            root.set_obfuscation_key(obfuscation_key)
+        root.__build(entries, common_lengths, 0, 0, len(entries))
+        return root
+
+    def __build(
+        self, entries: list[ManifestEntry], common_lengths: list[int], depth: int, start: int, end: int
+    ) -> None:
+        """
+        Builds the node of `depth` from `entries[start:end]`, which all start with the same `depth` long path.
+        """
+        index = start
+        while index < end and len(entries[index][0]) == depth:
+            path, entry, metadata = entries[index]
+            self.set_entry(entry)
+            if metadata:
+                self.set_metadata(metadata)
+            if index == start and depth > 0:
+                # * `add_fork` creates the node as a leaf of the first path and sets its separator flag with the
+                # * prefix of that time, before the later paths shortened it
+                attached_at = common_lengths[index]
+                prefix_max_size = NODE_FORK_SIZES.prefix_max_size
+                created_at = attached_at + prefix_max_size * ((depth - attached_at - 1) // prefix_max_size)
+                self.__update_with_path_separator(path[created_at:])
+            index += 1
+
+        if index == end:
+            return
+
+        self.forks = {}
+        self.__make_edge()
+
+        while index < end:
+            group_start = index
+            index += 1
+            while index < end and common_lengths[index] > depth:
+                index += 1
+
+            path = entries[group_start][0]
+            # * depth of the next branching or value node under this fork
+            if index - group_start > 1:
+                branch_depth = min(common_lengths[group_start + 1 : index])
+            else:
+                branch_depth = len(path)
+
+            parent, parent_depth = self.__build_chunks(path, depth, common_lengths[group_start], branch_depth)
+            node = MantarayNode()
+            node.__obfuscation_key = self.__obfuscation_key
+            node.__build(entries, common_lengths, branch_depth, group_start, index)
+            prefix = path[parent_depth:branch_depth]
+            node.__update_with_path_separator(prefix)
+            parent.__attach(prefix, node)
+
+    def __build_chunks(
+        self, path: bytes, depth: int, attached_at: int, branch_depth: int
+    ) -> tuple["MantarayNode", int]:
+        """
+        Creates the edge nodes between `depth` and `branch_depth` where `add_fork` chunked `path` to
+        prefix_max_size long prefixes from `attached_at`. Returns the deepest node and its depth.
+        """
+        prefix_max_size = NODE_FORK_SIZES.prefix_max_size
+        parent, parent_depth = self, depth
+        boundary = attached_at + prefix_max_size * ((depth - attached_at) // prefix_max_size + 1)
+        while boundary < branch_depth:
+            node = MantarayNode()
+            node.__obfuscation_key = self.__obfuscation_key
+            node.forks = {}
+            node.__make_edge()
+            prefix = path[parent_depth:boundary]
+            node.__update_with_path_separator(prefix)
+            parent.__attach(prefix, node)
+            parent, parent_depth = node, boundary
+            boundary += prefix_max_size
+        return parent, parent_depth
+
     def get_fork_at_path(self, path: bytes) -> Optional[MantarayFork]:
         """
         Retrieves a MantarayFork under the given path.
@@ -408,6 +834,8 @@ class MantarayNode(BaseModel):
         if not path:
             raise EmptyPathError()
 
+        self.__resolve()
+
         if self.forks is None:
             msg = "Fork mapping is not defined in the manifest"
             raise ValueError(msg)
@@ -415,26 +843,36 @@ class MantarayNode(BaseModel):
         fork: MantarayFork = self.forks.get(path[0])  # type: ignore
         # print(f"{path=}")
         if fork is None:
-            raise NotFoundError(path, fork.prefix)
+            raise NotFoundError(path)
 
         if path.startswith(fork.prefix):
             rest = path[len(fork.prefix) :]
             if not rest:
+                fork.node.__resolve()
                 return fork
             return fork.node.get_fork_at_path(rest)
         else:
             raise NotFoundError(path, fork.prefix)
 
-    def remove_path(self, path: bytes) -> None:
+    def remove_path(self, path: bytes, *, compact: bool = False) -> None:
         """
         Removes a path from the node.
 
+        With `compact`, the nodes on the path that are left without entry and forks are removed as well, and
+        the chains of nodes without entry and metadata that are left with a single fork are repacked to
+        prefix_max_size long prefixes from the node above them, as `add_fork` chunks a new path. The chunk
+        boundaries of a freshly built manifest depend on its insertion order, so the result can differ from it.
+
         Parameters:
         - path (bytes): The path in bytes.
+        - compact (bool): Whether to remove and merge the nodes that the removal left empty or with a single fork.
         """
         if len(path) == 0:
             msg = "Path is empty"
             raise ValueError(msg)
+
+        self.__resolve()
+
         if self.forks is None:
             msg = "Fork mapping is not defined in the manifest"
             raise ValueError(msg)
@@ -453,33 +891,442 @@ class MantarayNode(BaseModel):
             if len(rest) == 0:
                 self.make_dirty()
                 del self.forks[path[0]]
+                fork.node.__parent = None
                 return
             else:
-                fork.node.remove_path(rest)
+                fork.node.remove_path(rest, compact=compact)
+                if compact:
+                    self.__compact_fork(fork)
         else:
             raise NotFoundError(path, fork.prefix)
 
+    def __compact_fork(self, fork: MantarayFork) -> None:
+        """
+        Removes the fork if its node has neither entry nor forks, or repacks the chain of nodes without entry and
+        metadata and with a single fork under it to the prefix_max_size long prefixes that `add_fork` creates.
+        """
+        node = fork.node
+        node_type = node.__type or 0
+        if node_type & (NodeType.value.value | NodeType.with_metadata.value):
+            if not node.forks and node_type & NodeType.edge.value:
+                node.__type = node_type ^ NodeType.edge.value
+                self.make_dirty()
+            return
+
+        path, prefix_sizes, end = fork.prefix, [len(fork.prefix)], node
+        while not (end.__type or 0) & (NodeType.value.value | NodeType.with_metadata.value):
+            end.__resolve()
+            if len(end.forks or {}) != 1:
+                break
+            (end_fork,) = end.forks.values()  # type: ignore
+            path += end_fork.prefix
+            prefix_sizes.append(len(end_fork.prefix))
+            end = end_fork.node
+
+        if not end.forks and not (end.__type or 0) & (NodeType.value.value | NodeType.with_metadata.value):
+            del self.forks[fork.prefix[0]]  # type: ignore
+            node.__parent = None
+            self.make_dirty()
+            return
+
+        prefix_max_size = NODE_FORK_SIZES.prefix_max_size
+        if end is node or prefix_sizes == [
+            min(prefix_max_size, len(path) - i) for i in range(0, len(path), prefix_max_size)
+        ]:
+            return
+        node.__parent = None
+        parent, depth = self.__build_chunks(path, 0, 0, len(path))
+        end.__update_with_path_separator(path[depth:])
+        parent.__attach(path[depth:], end)
+        self.make_dirty()
+
+    def apply(self, changes: Iterable[ManifestChange]) -> None:
+        """
+        Applies a batch of `(path, entry, metadata)` changes, a change with a `None` entry removes its path.
+
+        The result is the same as calling `add_fork` and `remove_path` with the changes in path order,
+        the changes of the same path are applied in their input order. The changes are grouped by
+        forks, so a fork on the changed paths is walked, updated and marked dirty once instead of once
+        per change, and a new subtree is built at once the same way as `from_entries` builds it.
+
+        Parameters:
+        - changes (Iterable[ManifestChange]): The changes of the manifest.
+
+        Raises:
+        NotFoundError: If a removed path is not in the manifest. The changes of the other forks may have
+        been applied already.
+        """
+        changes = sorted(changes, key=itemgetter(0))
+        self.__apply(changes, 0, 0, len(changes))
+
+    def __apply(self, changes: list[ManifestChange], depth: int, start: int, end: int) -> None:
+        """
+        Applies `changes[start:end]`, which all start with the same `depth` long path of this node.
+        """
+        self.__resolve()
+        index = start
+        while index < end and len(changes[index][0]) == depth:
+            self.__apply_change(changes[index], depth)
+            index += 1
+
+        while index < end:
+            group_start, byte = index, changes[index][0][depth]
+            while index < end and changes[index][0][depth] == byte:
+                index += 1
+            self.__apply_to_fork(changes, depth, group_start, index)
+
+    def __apply_to_fork(self, changes: list[ManifestChange], depth: int, start: int, end: int) -> None:
+        """
+        Applies `changes[start:end]`, which continue with the same byte after the `depth` long path of this node.
+        """
+        byte = changes[start][0][depth]
+        fork: Optional[MantarayFork] = None if self.forks is None else self.forks.get(byte)
+        if (
+            fork is None
+            and (self.forks is not None or self.is_dirty())
+            and all(changes[index][1] is not None for index in range(start, end))
+        ):
+            # * a new subtree is built at once, `__build` creates the same nodes as `add_fork` path by path
+            entries = changes[start:end]
+            common_lengths = [depth] + [
+                common_prefix_length(entries[index - 1][0], entries[index][0]) for index in range(1, len(entries))
+            ]
+            subtree = MantarayNode()
+            subtree.__obfuscation_key = self.__obfuscation_key
+            subtree.__build(entries, common_lengths, depth, 0, len(entries))  # type: ignore
+            fork = subtree.forks[byte]  # type: ignore
+            if self.forks is None:
+                self.forks = {}
+            self.__attach(fork.prefix, fork.node)
+            self.__make_edge()
+            self.make_dirty()
+            return
+
+        index = start
+        while index < end:
+            fork = None if self.forks is None else self.forks.get(byte)
+            fork_start = index
+            if fork is not None:
+                prefix = fork.prefix
+                fork_depth = depth + len(prefix)
+                # * the changes under the fork, a removal of the fork itself is applied on its own
+                while (
+                    index < end
+                    and changes[index][0].startswith(prefix, depth)
+                    and (changes[index][1] is not None or len(changes[index][0]) > fork_depth)
+                ):
+                    index += 1
+            if fork is None or index == fork_start:
+                # * the change creates, splits or removes the fork
+                self.__apply_change(changes[index], depth)
+                index += 1
+                continue
+
+            adds = any(changes[fork_index][1] is not None for fork_index in range(fork_start, index))
+            if adds:
+                # * `add_fork` updates the fork on the way down for every added path
+                fork.node.__update_with_path_separator(prefix)
+                self.__attach(prefix, fork.node)
+                self.__make_edge()
+            fork.node.__apply(changes, fork_depth, fork_start, index)
+            if adds:
+                self.make_dirty()
+
+    def __apply_change(self, change: ManifestChange, depth: int) -> None:
+        path, entry, metadata = change
+        if entry is None:
+            self.remove_path(path[depth:])
+        else:
+            self.add_fork(path[depth:], entry, metadata)
+
+    def with_fork(self, path: bytes, entry: Reference, metadata: Optional[MetadataMapping] = None) -> "MantarayNode":
+        """
+        Returns a new version of the manifest with the fork added, see `add_fork`. This manifest is not changed.
+
+        Only the nodes along `path` are copied, the new version shares every other fork with this one, so
+        the unchanged subtrees keep their content addresses and are not saved again. Shared nodes belong
+        to several versions, versions have to be changed with `with_fork` and `without_path` only.
+
+        Parameters:
+        - path (bytes): The path of the fork.
+        - entry (Reference): The entry to be associated with the fork.
+        - metadata (Optional[MetadataMapping]): Additional metadata to associate with the fork.
+
+        Returns:
+        MantarayNode: The root node of the new version.
+        """
+        root = self.__copy_path(path)
+        root.add_fork(path, entry, metadata)
+        return root
+
+    def without_path(self, path: bytes) -> "MantarayNode":
+        """
+        Returns a new version of the manifest with the path removed, see `remove_path` and `with_fork`.
+        This manifest is not changed.
+
+        Parameters:
+        - path (bytes): The path in bytes.
+
+        Returns:
+        MantarayNode: The root node of the new version.
+        """
+        root = self.__copy_path(path)
+        root.remove_path(path)
+        return root
+
+    def __copy_path(self, path: bytes) -> "MantarayNode":
+        """
+        Copies the nodes that `add_fork` or `remove_path` change for `path`: the nodes whose prefix is on
+        `path` and the node where it leaves the tree, whose fork is split by `add_fork`.
+        """
+        self.__resolve()
+        root = node = self.__copy()
+        while path and node.forks:
+            fork = node.forks.get(path[0])
+            if fork is None:
+                break
+            fork.node.__resolve()
+            fork_node = fork.node.__copy()
+            node.forks[path[0]] = MantarayFork(prefix=fork.prefix, node=fork_node)
+            if not path.startswith(fork.prefix):
+                break
+            path = path[len(fork.prefix) :]
+            node = fork_node
+        return root
+
+    def __copy(self) -> "MantarayNode":
+        """
+        Returns a detached copy of the node that shares its forks.
+        """
+        node = MantarayNode()
+        node.__type = self.__type
+        node.__obfuscation_key = self.__obfuscation_key
+        node.__content_address = self.__content_address
+        node.__entry = self.__entry
+        node.__metadata = self.__metadata
+        # * the shared fork nodes stay linked to this node
+        node.__forks = None if self.__forks is None else ForkMapping(node, self.__forks)
+        return node
+
+    def iter_entries(self, prefix: bytes = b"") -> Iterator[ManifestEntry]:
+        """
+        Yields `(path, entry, metadata)` of the value nodes under the given path prefix in lexicographic order.
+
+        The manifest is walked with an explicit stack. Unresolved forks of a loaded manifest are fetched
+        when the walk reaches them, but the fetched nodes are not kept in the tree, so the memory use
+        does not grow with the number of the walked entries and the walk can be stopped at any point.
+
+        Parameters:
+        - prefix (bytes): Only the entries whose path starts with it are yielded.
+        """
+        stack: list[tuple[bytes, MantarayNode]] = [(b"", self)]
+        while stack:
+            path, node = stack.pop()
+            loaded = node.__loaded_view()
+
+            if len(path) >= len(prefix) and node.__type is not None and node.__type & NodeType.value.value:
+                yield path, loaded.get_entry(), node.get_metadata()  # type: ignore
+
+            if not loaded.forks:
+                continue
+            # * forks are pushed in reverse byte order so that they are popped in ascending order
+            for byte in sorted(loaded.forks, reverse=True):
+                fork = loaded.forks[byte]
+                fork_path = path + fork.prefix
+                compared_length = min(len(fork_path), len(prefix))
+                if fork_path[:compared_length] == prefix[:compared_length]:
+                    stack.append((fork_path, fork.node))
+
+    def diff(self, other: "MantarayNode") -> ManifestDiff:
+        """
+        Compares the entries of this manifest with the entries of `other`.
+
+        The two trees are walked side by side. A pair of nodes with the same content address has the
+        same subtree, so it is skipped without loading or visiting its forks. Unresolved forks of loaded
+        manifests are fetched only where the two manifests differ, and they are not kept in the trees.
+
+        Parameters:
+        - other (MantarayNode): The manifest to compare with.
+
+        Returns:
+        - ManifestDiff: The paths that are added, removed or changed in `other`.
+        """
+        result = ManifestDiff([], [], [])
+        self.__diff(other, b"", result)
+        return result
+
+    def __diff(self, other: "MantarayNode", path: bytes, result: ManifestDiff) -> None:
+        """
+        Adds the differences of the subtrees of two nodes under `path` to `result`.
+        """
+        is_value = self.__type is not None and self.__type & NodeType.value.value
+        other_is_value = other.__type is not None and other.__type & NodeType.value.value
+        # * the type and the metadata of a node are stored in the fork of its parent, not in its own chunk.
+        # * The root has no parent, its metadata is not persisted
+        same_metadata = not path or self.__same_metadata(other)
+
+        if self.__content_address is not None and self.__content_address == other.__content_address:
+            if is_value and other_is_value and not same_metadata:
+                result.changed.append(path)
+            elif is_value and not other_is_value:
+                result.removed.append(path)
+            elif other_is_value and not is_value:
+                result.added.append(path)
+            return
+
+        loaded, other_loaded = self.__loaded_view(), other.__loaded_view()
+        if is_value and other_is_value:
+            if not same_metadata or loaded.get_entry() != other_loaded.get_entry():
+                result.changed.append(path)
+        elif is_value:
+            result.removed.append(path)
+        elif other_is_value:
+            result.added.append(path)
+
+        forks: dict[int, MantarayFork] = loaded.forks or {}
+        other_forks: dict[int, MantarayFork] = other_loaded.forks or {}
+        for byte in sorted(forks.keys() | other_forks.keys()):
+            fork, other_fork = forks.get(byte), other_forks.get(byte)
+            if fork is not None and other_fork is not None and fork.prefix == other_fork.prefix:
+                fork.node.__diff(other_fork.node, path + fork.prefix, result)
+            else:
+                # * the fork is only in one of the manifests or the paths are split up differently,
+                # * the entries of the two subtrees are compared one by one
+                diff_entries(fork_entries(path, fork), fork_entries(path, other_fork), result)
+
+    def __same_metadata(self, other: "MantarayNode") -> bool:
+        serialised_metadata = self.get_serialised_metadata()
+        if serialised_metadata is not None and serialised_metadata == other.get_serialised_metadata():
+            return True
+        return (self.get_metadata() or None) == (other.get_metadata() or None)
+
     def load(self, storage_loader: StorageLoader, reference: Reference) -> None:
+        """
+        Loads the node from the storage.
+
+        Only the chunk of this node is fetched. Its forks stay unresolved references until
+        `get_fork_at_path`, `add_fork` or `remove_path` goes through them, at which point they are
+        fetched with the same `storage_loader`.
+
+        Parameters:
+        - storage_loader (StorageLoader): Function that returns the serialised node of a reference.
+        - reference (Reference): Reference of the node.
+        """
         if not reference:
             msg = "Reference is undefined at manifest load"
             raise ValueError(msg)
-        data = storage_loader(reference)
-        console.log(f"Data from bee: {data.hex()=}")
-        self.deserialise(data)
+        self.__storage_loader = None
+        data = load_chunk(storage_loader, reference)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded chunk %s: %s", reference.hex(), data.hex())
+        self.deserialise(data, storage_loader)
         self.set_content_address(reference)
 
-    def save(self, storage_saver: StorageSaver) -> Reference:
+    def __resolve(self) -> None:
+        """
+        Fetches the chunk of a node that has been deserialised as an unresolved fork reference.
+        """
+        if self.__storage_loader is None:
+            return
+        self.load(self.__storage_loader, self.__content_address)  # type: ignore
+
+    def __loaded_view(self) -> "MantarayNode":
+        """
+        Returns the node itself if it is resolved, otherwise a detached copy of it that is loaded from its
+        chunk. The node in the tree stays unresolved.
+        """
+        if self.__storage_loader is None:
+            return self
+        loaded = MantarayNode()
+        loaded.load(self.__storage_loader, self.__content_address)  # type: ignore
+        return loaded
+
+    def save(
+        self,
+        storage_saver: Optional[StorageSaver] = None,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        batch_storage_saver: Optional[BatchStorageSaver] = None,
+    ) -> Reference:
         """
         Saves dirty flagged ManifestNodes and its forks recursively.
 
+        If an `executor` or `max_workers` is given, the dirty nodes are saved bottom-up level by level:
+        every node of a level is serialised and passed to `storage_saver` concurrently, and a level
+        is only started when the references of all of its forks are known.
+
+        If a `batch_storage_saver` is given, it is called once per level with the serialised nodes
+        of that level instead of calling `storage_saver` per node.
+
         Parameters:
         - StorageSaver (StorageSaver): An instance of StorageSaver responsible for saving data.
+        - executor (Optional[Executor]): Executor that runs the `storage_saver` calls of a level.
+        - max_workers (Optional[int]): Number of threads of the pool that is created when no `executor` is given.
+        - batch_storage_saver (Optional[BatchStorageSaver]): Saves all serialised nodes of a level at once.
+
+        Returns:
+        - Reference: Reference of the top manifest node.
+        """
+        if batch_storage_saver is not None:
+            return self.__save_by_levels(
+                lambda level: save_chunks(batch_storage_saver, [node.serialise() for node in level])
+            )
+
+        if storage_saver is None:
+            msg = "Either storage_saver or batch_storage_saver has to be given"
+            raise ValueError(msg)
+
+        if executor is None and max_workers is None:
+            result = self.__recursive_save(storage_saver)
+            return result["reference"]
+
+        def save_level(level: list[MantarayNode], executor: Executor) -> list[Reference]:
+            return list(executor.map(lambda node: save_chunk(storage_saver, node.serialise()), level))
+
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+                return self.__save_by_levels(lambda level: save_level(level, thread_pool))
+        return self.__save_by_levels(lambda level: save_level(level, executor))
+
+    async def async_load(self, storage_loader: AsyncStorageLoader, reference: Reference) -> None:
+        """
+        Loads the node from the storage with an asynchronous storage loader.
+
+        Parameters:
+        - storage_loader (AsyncStorageLoader): Coroutine function that returns the serialised node of a reference.
+        - reference (Reference): Reference of the node.
+        """
+        if not reference:
+            msg = "Reference is undefined at manifest load"
+            raise ValueError(msg)
+        self.__storage_loader = None
+        data = await async_load_chunk(storage_loader, reference)
+        self.deserialise(data)
+        # * the forks that are not loaded are saved by their reference, as with `load`
+        for fork in (self.forks or {}).values():
+            if fork.node.get_entry():
+                fork.node.set_content_address(fork.node.get_entry())
+        self.set_content_address(reference)
+
+    async def async_save(self, storage_saver: AsyncStorageSaver, max_concurrency: int = MAX_CONCURRENCY) -> Reference:
+        """
+        Saves dirty flagged ManifestNodes and its forks with an asynchronous storage saver.
+
+        Sibling forks are saved concurrently, a node is saved once all of its forks have their references.
+
+        Parameters:
+        - storage_saver (AsyncStorageSaver): Coroutine function that saves data and returns its reference.
+        - max_concurrency (int): Maximum number of `storage_saver` calls in flight.
 
         Returns:
         - Reference: Reference of the top manifest node.
         """
-        result = self.__recursive_save(storage_saver)
-        return result.get("reference")  # type: ignore
+        # * asyncio is slow to import, it is only imported once the async API is used
+        import asyncio  # noqa: PLC0415
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        result = await self.__async_recursive_save(storage_saver, semaphore)
+        return result["reference"]
 
     def is_dirty(self) -> bool:
         """
@@ -492,10 +1339,17 @@ class MantarayNode(BaseModel):
 
     def make_dirty(self) -> None:
         """
-        Marks the content_address to None.
+        Marks the content_address to None, together with the content_address of the ancestor nodes
+        whose chunks refer to this node, so that `save` only has to visit the changed paths.
+        An unresolved node is loaded first, so that it is saved with its forks.
         """
-        self.__content_address = None
+        self.__resolve()
+        node: Optional[MantarayNode] = self
+        while node is not None:
+            node.__content_address = None
+            node = node.__parent
 
+    @timed(SERIALISE, lambda result, _: len(result))
     def serialise(self) -> bytes:
         """
         serialises the node and its forks into a byte array.
@@ -504,8 +1358,8 @@ class MantarayNode(BaseModel):
         - bytes: serialised byte array representation of the node.
         """
         if not self.__obfuscation_key:
-            self.set_obfuscation_key(bytes(32))
-            # self.set_obfuscation_key(
+            # * the default key does not change the content, so the node is not made dirty
+            self.__obfuscation_key = bytes(32)
         if self.forks is None:
             if not self.__entry:
                 msg = "Entry"
@@ -523,21 +1377,19 @@ class MantarayNode(BaseModel):
 
         # ForksIndexBytes
         index: IndexBytes = IndexBytes()
-        for fork_index in self.forks.keys():
+        for fork_index in self.forks.keys():  # type: ignore
             index.set_byte(int(fork_index))
         index_bytes = index.get_bytes()
 
         # Forks
         fork_serialisations: bytearray = bytearray([])
 
-        for byte in range(256):
-            byte = int(byte)
-            if index.check_byte_present(byte):
-                fork: MantarayFork = self.forks.get(byte)  # type: ignore
-                if fork is None:
-                    msg = f"Fork indexing error: fork has not found under {byte!r} index"
-                    raise Exception(msg)
-                fork_serialisations += bytearray(fork.serialise())
+        for byte in index:
+            fork: MantarayFork = self.forks.get(byte)  # type: ignore
+            if fork is None:
+                msg = f"Fork indexing error: fork has not found under {byte!r} index"
+                raise Exception(msg)
+            fork_serialisations += bytearray(fork.serialise())
 
         # console.print(f"{bytearray(self.__obfuscation_key)=}")
         # console.print(f"{version_bytes=}")
@@ -548,7 +1400,7 @@ class MantarayNode(BaseModel):
 
         bytes_data = b"".join(
             [
-                self.__obfuscation_key,  # type: ignore
+                self.__obfuscation_key,
                 version_bytes,
                 reference_len_bytes,
                 self.__entry,
@@ -565,37 +1417,42 @@ class MantarayNode(BaseModel):
 
         return bytes_data
 
-    def deserialise(self, data: bytes) -> None:
+    @timed(DESERIALISE, lambda _, args: len(args[1]))
+    def deserialise(self, data: bytes, storage_loader: Optional[StorageLoader] = None) -> None:
         """
         Deserialises a byte array back into a node.
 
         Parameters:
         - data (bytes): Byte array representation of the node.
+        - storage_loader (Optional[StorageLoader]): If given, the fork nodes are kept as unresolved
+        references and loaded with it on first traversal.
         """
-        node_header_sizes = NodeHeaderSizes()
+        node_header_sizes = NODE_HEADER_SIZES
         node_header_size = node_header_sizes.full
 
         if len(data) < node_header_size:
             msg = "The serialised input is too short"
             raise ValueError(msg)
 
-        self.__obfuscation_key = data[: node_header_sizes.obfuscation_key]
-        data = encrypt_decrypt(self.__obfuscation_key, data, len(self.__obfuscation_key))  # type: ignore
+        self.__obfuscation_key = bytes(data[: node_header_sizes.obfuscation_key])
+        # * the chunk is decrypted once into a single buffer, the forks keep memoryview slices of it
+        data = memoryview(encrypt_decrypt(self.__obfuscation_key, data, len(self.__obfuscation_key)))  # type: ignore
 
         version_hash = data[
             node_header_sizes.obfuscation_key : node_header_sizes.obfuscation_key + node_header_sizes.version_hash
         ]
 
-        if equal_bytes(version_hash, serialise_version("0.1")):
+        if version_hash == serialise_version("0.1"):
             raise NotImplementedError()
-        elif equal_bytes(version_hash, serialise_version("0.2")):
+        elif version_hash == serialise_version("0.2"):
             ref_bytes_size = data[node_header_size - 1]
             entry = data[node_header_size : node_header_size + ref_bytes_size]
 
             # FIXME: in Bee. if one uploads a file on the bzz endpoint, the node under `/` gets 0 refsize
             if ref_bytes_size == 0:
                 entry = bytes(32)
-            self.set_entry(bytes(entry))
+            # * the loaded content is not a change, neither this node nor its ancestors are made dirty
+            self.__set_entry(entry)
             offset = node_header_size + ref_bytes_size
             index_bytes = data[offset : offset + 32]
 
@@ -606,60 +1463,61 @@ class MantarayNode(BaseModel):
             is an edge, so we will deduce this information from index byte array
             """
 
-            if not equal_bytes(index_bytes, bytes(32)):
+            index_forks = IndexBytes.from_bytes(index_bytes)
+            if index_forks.bitmap:
                 self.__make_edge()
-            self.forks = {}
-            index_forks: IndexBytes = IndexBytes()
-            index_forks.set_bytes(bytearray(index_bytes))
+            # * the loaded forks are not a change of the node
+            forks: dict[int, MantarayFork] = {}
             offset += 32
-            node_fork_sizes = NodeForkSizes()
+            node_fork_sizes = NODE_FORK_SIZES
+
+            for byte in index_forks:
+                if len(data) < offset + node_fork_sizes.node_type:
+                    msg = f"There is not enough size to read nodeType of fork at offset {offset}"
+                    raise ValueError(msg)
+
+                node_fork_size = node_fork_sizes.pre_reference + ref_bytes_size
+
+                if node_type_is_with_metadata_type(data[offset]):
+                    if len(data) < offset + node_fork_sizes.pre_reference + ref_bytes_size + node_fork_sizes.metadata:
+                        msg = f"Not enough bytes for metadata node fork at byte {byte}"
+                        raise ValueError(msg)
 
-            for byte in range(256):
-                if index_forks.check_byte_present(byte):
-                    if len(data) < offset + node_fork_sizes.node_type:
-                        msg = f"There is not enough size to read nodeType of fork at offset {offset}"
+                    metadata_byte_size = int.from_bytes(
+                        data[offset + node_fork_size : offset + node_fork_size + node_fork_sizes.metadata],
+                        byteorder="big",
+                    )
+                    node_fork_size += node_fork_sizes.metadata + metadata_byte_size
+
+                    fork = MantarayFork.deserialise(
+                        data[offset : offset + node_fork_size],
+                        self.__obfuscation_key,
+                        {
+                            "with_metadata": {
+                                "ref_bytes_size": ref_bytes_size,
+                                "metadata_byte_size": metadata_byte_size,
+                            }
+                        },
+                    )
+                else:
+                    if len(data) < offset + node_fork_sizes.pre_reference + ref_bytes_size:
+                        msg = f"There is not enough size to read fork at offset {offset}"
                         raise ValueError(msg)
 
-                    node_type = data[offset : offset + node_fork_sizes.node_type]
-                    node_fork_size = node_fork_sizes.pre_reference + ref_bytes_size
-
-                    if node_type_is_with_metadata_type(node_type[0]):
-                        if (
-                            len(data)
-                            < offset + node_fork_sizes.pre_reference + ref_bytes_size + node_fork_sizes.metadata
-                        ):
-                            msg = f"Not enough bytes for metadata node fork at byte {byte}"
-                            raise ValueError(msg)
-
-                        metadata_byte_size = int.from_bytes(
-                            data[offset + node_fork_size : offset + node_fork_size + node_fork_sizes.metadata],
-                            byteorder="big",
-                        )
-                        node_fork_size += node_fork_sizes.metadata + metadata_byte_size
-
-                        fork = MantarayFork.deserialise(
-                            data[offset : offset + node_fork_size],
-                            self.__obfuscation_key,
-                            {
-                                "with_metadata": {
-                                    "ref_bytes_size": ref_bytes_size,
-                                    "metadata_byte_size": metadata_byte_size,
-                                }
-                            },
-                        )
-                    else:
-                        if len(data) < offset + node_fork_sizes.pre_reference + ref_bytes_size:
-                            msg = f"There is not enough size to read fork at offset {offset}"
-                            raise ValueError(msg)
-
-                        fork = MantarayFork.deserialise(data[offset : offset + node_fork_size], self.__obfuscation_key)
-                    self.forks[byte] = fork
-                    offset += node_fork_size
+                    fork = MantarayFork.deserialise(data[offset : offset + node_fork_size], self.__obfuscation_key)
+
+                if storage_loader is not None and fork.node.get_entry():
+                    fork.node.set_content_address(fork.node.get_entry())  # type: ignore
+                    fork.node.__storage_loader = storage_loader
+                fork.node.__parent = self
+                forks[byte] = fork
+                offset += node_fork_size
+            self.__forks = ForkMapping(self, forks)
         else:
             msg = "Wrong mantaray version"
             raise ValueError(msg)
 
-    def __recursive_save(self, storage_saver: StorageSaver) -> dict:
+    def __recursive_save(self, storage_saver: StorageSaver) -> RecursiveSaveReturnType:
         """
         Recursively saves the node and its forks.
 
@@ -670,33 +1528,209 @@ class MantarayNode(BaseModel):
         - dict: A dictionary containing the reference of the top manifest node and a
         flag indicating if the node was changed.
         """
-        # * Save forks first recursively
-        save_returns = []
+        # * Changes make the ancestors dirty too, so a clean node has no changes in its subtree either.
+        # * Unresolved fork references are clean as well
+        if self.__content_address is not None:
+            return {"reference": self.__content_address, "changed": False}
 
         # * There was no intention to define fork(s)
         if self.forks is None:
             self.forks = {}
 
-        for fork in self.forks.values():
-            save_returns.append(fork.node.__recursive_save(storage_saver))
+        # * Save forks first recursively
+        for fork in self.forks.values():  # type: ignore
+            fork.node.__recursive_save(storage_saver)
+
+        # Save the actual manifest as well
+        data = self.serialise()
+        reference = save_chunk(storage_saver, data)
+        self.set_content_address(reference)
+
+        return {"reference": reference, "changed": True}
+
+    def __collect_dirty_levels(self, levels: list[list["MantarayNode"]]) -> int:
+        """
+        Groups the nodes that have to be saved by their height among the nodes that have to be saved.
+
+        Parameters:
+        - levels (list[list[MantarayNode]]): Nodes to save per level, leaves first. Filled in place.
+
+        Returns:
+        - int: The level of the node or -1 if neither the node nor its forks have to be saved.
+        """
+        if self.__content_address is not None:
+            return -1
+
+        if self.forks is None:
+            self.forks = {}
+
+        level = -1
+        for fork in self.forks.values():  # type: ignore
+            level = max(level, fork.node.__collect_dirty_levels(levels))
+
+        level += 1
+        if len(levels) == level:
+            levels.append([])
+        levels[level].append(self)
+
+        return level
+
+    def __save_by_levels(self, save_level: Callable[[list["MantarayNode"]], list[Reference]]) -> Reference:
+        """
+        Saves the dirty nodes level by level, leaves first.
+
+        Parameters:
+        - save_level (Callable): Saves the nodes of a level and returns their references in the same order.
+
+        Returns:
+        - Reference: Reference of the top manifest node.
+        """
+        levels: list[list[MantarayNode]] = []
+        self.__collect_dirty_levels(levels)
+
+        for level in levels:
+            references = save_level(level)
+            if len(references) != len(level):
+                msg = f"Expected {len(level)} references for the saved level. Got: {len(references)}"
+                raise ValueError(msg)
+            for node, reference in zip(level, references):
+                node.set_content_address(reference)
+
+        return self.__content_address  # type: ignore
+
+    async def __async_recursive_save(
+        self, storage_saver: AsyncStorageSaver, semaphore: "asyncio.Semaphore"
+    ) -> RecursiveSaveReturnType:
+        """
+        Recursively saves the node and its forks, awaiting the forks concurrently.
 
-        if self.__content_address and all(not v["changed"] for v in save_returns):
+        Parameters:
+        - storage_saver (AsyncStorageSaver): Coroutine function that saves data and returns its reference.
+        - semaphore (asyncio.Semaphore): Limits the number of `storage_saver` calls in flight.
+
+        Returns:
+        - dict: A dictionary containing the reference of the top manifest node and a
+        flag indicating if the node was changed.
+        """
+        import asyncio  # noqa: PLC0415
+
+        if self.__content_address is not None:
             return {"reference": self.__content_address, "changed": False}
 
-        # Save the actual manifest as well
+        if self.forks is None:
+            self.forks = {}
+
+        await asyncio.gather(
+            *(fork.node.__async_recursive_save(storage_saver, semaphore) for fork in self.forks.values())  # type: ignore
+        )
+
         data = self.serialise()
-        reference = storage_saver(data)
+        async with semaphore:
+            reference = await async_save_chunk(storage_saver, data)
         self.set_content_address(reference)
 
         return {"reference": reference, "changed": True}
 
+    # * defined last, the method shadows the `list` builtin in the annotations of the class body after it
+    def list(
+        self,
+        prefix: bytes = b"",
+        start_after: Optional[bytes] = None,
+        limit: int = 1000,
+        delimiter: Optional[bytes] = PATH_SEPARATOR,
+    ) -> ManifestListing:
+        """
+        Lists a page of the entries under the given path prefix in lexicographic order.
 
-class RecursiveSaveReturnType(BaseModel):
-    reference: Reference
-    changed: bool
+        The paths that contain `delimiter` after `prefix` are rolled up into common prefixes that end with
+        the delimiter, like the subdirectories of a directory listing, and their subtrees are not walked.
+        With the default path separator delimiter, a fork prefix is only searched for the separator if its
+        `with_path_separator` flag or its first byte shows that it has one. The nodes are walked like
+        `iter_entries` does, only the chunks of the listed entries and of the nodes on the way to them are
+        fetched.
+
+        Parameters:
+        - prefix (bytes): Only the paths that start with it are listed.
+        - start_after (Optional[bytes]): Only the entries and common prefixes after it are listed.
+        - limit (int): Maximum number of the listed entries and common prefixes together.
+        - delimiter (Optional[bytes]): Rolls up the paths into common prefixes, `None` lists every entry.
 
+        Returns:
+        ManifestListing: The listed entries and common prefixes, and `start_after` of the next page.
+
+        Raises:
+        ValueError: If `limit` is not positive.
+        """
+        if limit < 1:
+            msg = f"limit has to be positive, got {limit}"
+            raise ValueError(msg)
+
+        entries: list[ManifestEntry] = []
+        common_prefixes: list[bytes] = []
+        # * (path, path length of the parent, node)
+        stack: list[tuple[bytes, int, MantarayNode]] = [(b"", 0, self)]
+        while stack:
+            path, parent_length, node = stack.pop()
+            common_prefix = node.__delimited_prefix(path, parent_length, prefix, delimiter)
+            listed = common_prefix
+            if listed is None and len(path) >= len(prefix) and node.__type and node.__type & NodeType.value.value:
+                listed = path
+            if listed is not None and start_after is not None and listed <= start_after:
+                listed = None
+
+            if listed is not None and len(entries) + len(common_prefixes) == limit:
+                # * the page is full and there is a next one, it starts after the last listed path
+                last_listed = max(entries[-1][0] if entries else b"", common_prefixes[-1] if common_prefixes else b"")
+                return ManifestListing(entries, common_prefixes, last_listed)
+            if common_prefix is not None:
+                if listed is not None:
+                    common_prefixes.append(common_prefix)
+                continue
+
+            loaded = node.__loaded_view()
+            if listed is not None:
+                entries.append((path, loaded.get_entry(), node.get_metadata()))  # type: ignore
+
+            if not loaded.forks:
+                continue
+            # * forks are pushed in reverse byte order so that they are popped in ascending order
+            for byte in sorted(loaded.forks, reverse=True):
+                fork = loaded.forks[byte]
+                fork_path = path + fork.prefix
+                compared_length = min(len(fork_path), len(prefix))
+                if fork_path[:compared_length] != prefix[:compared_length]:
+                    continue
+                # * every path under the fork comes before `start_after`
+                if start_after is not None and fork_path < start_after and not start_after.startswith(fork_path):
+                    continue
+                stack.append((fork_path, len(path), fork.node))
+
+        return ManifestListing(entries, common_prefixes, None)
+
+    def __delimited_prefix(
+        self, path: bytes, parent_length: int, prefix: bytes, delimiter: Optional[bytes]
+    ) -> Optional[bytes]:
+        """
+        Returns the common prefix that the path of this node is rolled up into by `MantarayNode.list`, None if
+        the delimiter is not in its fork prefix after `prefix`. The path of the parent node does not contain
+        the delimiter, otherwise the parent would have been rolled up.
+        """
+        if not delimiter or len(path) <= len(prefix):
+            return None
+        if (
+            delimiter == PATH_SEPARATOR
+            and not (self.__type or 0) & NodeType.with_path_separator.value
+            and path[parent_length] != PATH_SEPARATOR_BYTE
+        ):
+            # * the flag is set if the fork prefix has a path separator after its first byte
+            return None
+        index = path.find(delimiter, max(len(prefix), parent_length - len(delimiter) + 1))
+        return None if index == -1 else path[: index + len(delimiter)]
+
+
+class NodeForkSizes:
+    __slots__ = ()
 
-class NodeForkSizes(BaseModel):
     node_type: int = 1
     prefix_length: int = 1
     # * Bytes length before `reference`
@@ -714,7 +1748,9 @@ class NodeForkSizes(BaseModel):
         return self.pre_reference - self.header
 
 
-class NodeHeaderSizes(BaseModel):
+class NodeHeaderSizes:
+    __slots__ = ()
+
     obfuscation_key: int = 32
     version_hash: int = 31
     # * Its value represents how long is the `entry` in bytes
@@ -725,6 +1761,10 @@ class NodeHeaderSizes(BaseModel):
         return self.obfuscation_key + self.version_hash + self.ref_bytes
 
 
+NODE_FORK_SIZES = NodeForkSizes()
+NODE_HEADER_SIZES = NodeHeaderSizes()
+
+
 class NotFoundError(Exception):
     def __init__(self, remaining_path_bytes: bytes, checked_prefix_bytes: Optional[bytes] = None):
         remaining_path = remaining_path_bytes.decode()
@@ -779,6 +1819,7 @@ def check_for_separator(node: MantarayNode) -> bool:
 
 
 # * The hash length has to be 31 instead of 32 that comes from the keccak hash function
+@lru_cache
 def serialise_version(version: Union[MarshalVersion, str]) -> bytes:
     """
     serialises the version into a 31-byte hash.
@@ -791,12 +1832,12 @@ def serialise_version(version: Union[MarshalVersion, str]) -> bytes:
     """
     version_name = "mantaray"
     version_separator = ":"
-    hash_bytes = keccak(text=(version_name + version_separator + version))
+    hash_bytes = keccak((version_name + version_separator + version).encode())
 
     return hash_bytes[:31]  # type: ignore
 
 
-def serialise_reference_len(entry: Reference) -> bytes:
+def serialise_reference_len(entry: Union[Reference, memoryview]) -> bytes:
     """
     serialises the reference length into a single byte.
 
@@ -829,11 +1870,101 @@ def load_all_nodes(storage_loader: StorageLoader, node: MantarayNode) -> None:
         return
 
     for fork in node.forks.values():
-        if fork.node.get_entry():
+        # * nodes resolved on an earlier lookup already have their forks
+        if fork.node.forks is None and fork.node.get_entry():
             fork.node.load(storage_loader, fork.node.get_entry())
         load_all_nodes(storage_loader, fork.node)
 
 
+async def async_load_all_nodes(
+    storage_loader: AsyncStorageLoader, node: MantarayNode, max_concurrency: int = MAX_CONCURRENCY
+) -> None:
+    """
+    Loads all nodes with an asynchronous storage loader, fetching sibling forks concurrently.
+
+    Parameters:
+    - storage_loader: Coroutine function that returns the serialised node of a reference.
+    - node: The initial node from which to start loading.
+    - max_concurrency: Maximum number of `storage_loader` calls in flight.
+    """
+    import asyncio  # noqa: PLC0415
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited_storage_loader(reference: Reference) -> bytes:
+        async with semaphore:
+            return await storage_loader(reference)
+
+    async def load_forks(parent: MantarayNode) -> None:
+        if parent.forks:
+            await asyncio.gather(*(load_fork_node(fork.node) for fork in parent.forks.values()))
+
+    async def load_fork_node(fork_node: MantarayNode) -> None:
+        if fork_node.forks is None and fork_node.get_entry():
+            await fork_node.async_load(limited_storage_loader, fork_node.get_entry())  # type: ignore
+        await load_forks(fork_node)
+
+    await load_forks(node)
+
+
+def diff(
+    a: Union[MantarayNode, Reference], b: Union[MantarayNode, Reference], storage_loader: Optional[StorageLoader] = None
+) -> ManifestDiff:
+    """
+    Compares the entries of two manifests, see `MantarayNode.diff`.
+
+    Parameters:
+    - a: The first manifest or the reference of its root node.
+    - b: The second manifest or the reference of its root node.
+    - storage_loader: Loads the chunks of the manifests that are given as references.
+
+    Returns:
+    - ManifestDiff: The paths that are added, removed or changed in `b`.
+    """
+    nodes = []
+    for manifest in (a, b):
+        if not isinstance(manifest, MantarayNode):
+            if storage_loader is None:
+                msg = "storage_loader has to be given to compare manifests by reference"
+                raise ValueError(msg)
+            node = MantarayNode()
+            node.load(storage_loader, manifest)
+            manifest = node
+        nodes.append(manifest)
+    return nodes[0].diff(nodes[1])
+
+
+def fork_entries(path: bytes, fork: Optional[MantarayFork]) -> Iterator[ManifestEntry]:
+    """
+    Yields the entries under a fork with their full paths, nothing if the fork is None.
+    """
+    if fork is None:
+        return
+    path += fork.prefix
+    for sub_path, entry, metadata in fork.node.iter_entries():
+        yield path + sub_path, entry, metadata
+
+
+def diff_entries(
+    entries: Iterator[ManifestEntry], other_entries: Iterator[ManifestEntry], result: ManifestDiff
+) -> None:
+    """
+    Adds the differences of two streams of entries sorted by path to `result`.
+    """
+    entry, other_entry = next(entries, None), next(other_entries, None)
+    while entry is not None or other_entry is not None:
+        if other_entry is None or (entry is not None and entry[0] < other_entry[0]):
+            result.removed.append(entry[0])  # type: ignore
+            entry = next(entries, None)
+        elif entry is None or other_entry[0] < entry[0]:
+            result.added.append(other_entry[0])
+            other_entry = next(other_entries, None)
+        else:
+            if entry[1] != other_entry[1] or (entry[2] or None) != (other_entry[2] or None):
+                result.changed.append(entry[0])
+            entry, other_entry = next(entries, None), next(other_entries, None)
+
+
 def equal_nodes(a: MantarayNode, b: MantarayNode, accumulated_prefix: str = "") -> None:
     """
     Compares two MantarayNode instances recursively and raises an exception if they are not equal.
@@ -0,0 +1,353 @@
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Union
+
+from mantaray_py.bmt import file_address
+from mantaray_py.types import Reference, StorageLoader
+
+# * 64 MiB of chunk data
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class CachingStorageLoader:
+    """
+    A StorageLoader wrapper that keeps the recently loaded chunks in memory.
+
+    Manifest chunks are content addressed, so a cached chunk never goes stale. Chunks are evicted
+    in least recently used order once the summed size of the cached chunks exceeds `max_size`.
+    It can be passed anywhere a StorageLoader is expected.
+
+    Attributes:
+        storage_loader (StorageLoader): The wrapped loader that is called on cache misses.
+        max_size (int): Maximum summed size of the cached chunks in bytes.
+        size (int): Summed size of the currently cached chunks in bytes.
+        hits (int): Number of loads served from the cache.
+        misses (int): Number of loads passed to `storage_loader`.
+        evictions (int): Number of chunks dropped from the cache.
+    """
+
+    def __init__(self, storage_loader: StorageLoader, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        if max_size < 0:
+            msg = f"Cache size cannot be negative. Got: {max_size}"
+            raise ValueError(msg)
+        self.storage_loader = storage_loader
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__chunks: OrderedDict[Reference, bytes] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __call__(self, reference: Reference) -> bytes:
+        reference = bytes(reference)
+        with self.__lock:
+            data = self.__chunks.get(reference)
+            if data is not None:
+                self.__chunks.move_to_end(reference)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = self.storage_loader(reference)
+        self.__put(reference, data)
+        return data
+
+    def __len__(self) -> int:
+        return len(self.__chunks)
+
+    def __contains__(self, reference: object) -> bool:
+        return reference in self.__chunks
+
+    def __put(self, reference: Reference, data: bytes) -> None:
+        # * a chunk that would evict everything else is not worth caching
+        if len(data) > self.max_size:
+            return
+
+        with self.__lock:
+            if reference in self.__chunks:
+                return
+            self.__chunks[reference] = data
+            self.size += len(data)
+            while self.size > self.max_size:
+                _, evicted = self.__chunks.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drops all cached chunks. The counters are kept.
+        """
+        with self.__lock:
+            self.__chunks.clear()
+            self.size = 0
+
+
+# * 1 GiB of chunk data
+DEFAULT_DISK_CACHE_SIZE = 1024 * 1024 * 1024
+# * Number of least recently used chunks deleted at once when the disk cache is over its size
+DISK_CACHE_EVICTION_BATCH = 64
+
+
+class DiskCachingStorageLoader:
+    """
+    A StorageLoader wrapper that keeps the loaded chunks in an sqlite database on the local disk.
+
+    The cache outlives the process, so warm restarts serve the chunks from disk. The database runs in
+    WAL mode with memory mapped reads, which lets several processes of one host read and fill the
+    same cache file concurrently. Chunks are evicted in least recently used order once their summed
+    size exceeds `max_size`.
+
+    Attributes:
+        storage_loader (StorageLoader): The wrapped loader that is called on cache misses.
+        path (str): Path of the sqlite database file.
+        max_size (int): Maximum summed size of the cached chunks in bytes.
+        hits (int): Number of loads of this instance served from the cache.
+        misses (int): Number of loads of this instance passed to `storage_loader`.
+        evictions (int): Number of chunks this instance dropped from the cache.
+    """
+
+    def __init__(
+        self, storage_loader: StorageLoader, path: Union[str, os.PathLike], max_size: int = DEFAULT_DISK_CACHE_SIZE
+    ) -> None:
+        if max_size < 0:
+            msg = f"Cache size cannot be negative. Got: {max_size}"
+            raise ValueError(msg)
+        self.storage_loader = storage_loader
+        self.path = os.fspath(path)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__lock = threading.Lock()
+        # * sqlite3 is slow to import, it is only imported once a disk cache is created
+        import sqlite3  # noqa: PLC0415
+
+        # * transactions are handled explicitly
+        self.__connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute(f"PRAGMA mmap_size={int(max_size)}")
+        with self.__transaction():
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS chunks "
+                "(reference BLOB PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS chunks_accessed ON chunks (accessed)")
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY, size INTEGER)")
+            self.__connection.execute("INSERT OR IGNORE INTO cache_size VALUES (0, 0)")
+
+    def __call__(self, reference: Reference) -> bytes:
+        reference = bytes(reference)
+        with self.__lock:
+            row = self.__connection.execute("SELECT data FROM chunks WHERE reference = ?", (reference,)).fetchone()
+            if row is not None:
+                self.__connection.execute(
+                    "UPDATE chunks SET accessed = ? WHERE reference = ?", (time.time(), reference)
+                )
+                self.hits += 1
+                return bytes(row[0])
+            self.misses += 1
+
+        data = self.storage_loader(reference)
+        self.__put(reference, data)
+        return data
+
+    def __enter__(self) -> "DiskCachingStorageLoader":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """
+        Summed size of the cached chunks in bytes, including the ones cached by other processes.
+        """
+        with self.__lock:
+            return int(self.__connection.execute("SELECT size FROM cache_size").fetchone()[0])
+
+    @contextmanager
+    def __transaction(self) -> Generator[None, None, None]:
+        # * IMMEDIATE takes the write lock upfront, so concurrent writers wait for each other instead of failing
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            raise
+        self.__connection.execute("COMMIT")
+
+    def __put(self, reference: Reference, data: bytes) -> None:
+        if len(data) > self.max_size:
+            return
+
+        with self.__lock, self.__transaction():
+            inserted = self.__connection.execute(
+                "INSERT OR IGNORE INTO chunks VALUES (?, ?, ?, ?)", (reference, data, len(data), time.time())
+            ).rowcount
+            if not inserted:
+                return
+            self.__connection.execute("UPDATE cache_size SET size = size + ?", (len(data),))
+
+            size = self.__connection.execute("SELECT size FROM cache_size").fetchone()[0]
+            while size > self.max_size:
+                evicted = self.__connection.execute(
+                    "SELECT reference, size FROM chunks ORDER BY accessed LIMIT ?", (DISK_CACHE_EVICTION_BATCH,)
+                ).fetchall()
+                for evicted_reference, evicted_size in evicted:
+                    if size <= self.max_size:
+                        break
+                    self.__connection.execute("DELETE FROM chunks WHERE reference = ?", (evicted_reference,))
+                    size -= evicted_size
+                    self.evictions += 1
+            self.__connection.execute("UPDATE cache_size SET size = ?", (size,))
+
+    def clear(self) -> None:
+        """
+        Drops all cached chunks from the database. The counters are kept.
+        """
+        with self.__lock, self.__transaction():
+            self.__connection.execute("DELETE FROM chunks")
+            self.__connection.execute("UPDATE cache_size SET size = 0")
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self.__lock:
+            self.__connection.close()
+
+
+class InMemoryStorageHandler:
+    """
+    A content addressed chunk store in memory that stands in for Bee.
+
+    `save` returns the same reference as uploading the data to Bee would, `load` returns the data of a
+    saved reference. Both can be called from several threads at once. The methods can be passed as
+    StorageSaver and StorageLoader, or wrapped into a `StorageHandler`.
+
+    Attributes:
+        save_count (int): Number of `save` calls.
+        saved_bytes (int): Summed size of the saved data in bytes.
+        load_count (int): Number of `load` calls.
+        loaded_bytes (int): Summed size of the loaded data in bytes.
+    """
+
+    def __init__(self) -> None:
+        self.save_count = 0
+        self.saved_bytes = 0
+        self.load_count = 0
+        self.loaded_bytes = 0
+        self.__chunks: dict[Reference, bytes] = {}
+        self.__lock = threading.Lock()
+
+    def save(self, data: bytes) -> Reference:
+        data = bytes(data)
+        # * hashing is done outside of the lock, it is the expensive part
+        reference = file_address(data)
+        with self.__lock:
+            self.__chunks.setdefault(reference, data)
+            self.save_count += 1
+            self.saved_bytes += len(data)
+        return reference
+
+    def load(self, reference: Reference) -> bytes:
+        """
+        Raises:
+        KeyError: If nothing has been saved under the reference.
+        """
+        reference = bytes(reference)
+        with self.__lock:
+            self.load_count += 1
+            data = self.__chunks.get(reference)
+            if data is None:
+                raise KeyError(reference.hex())
+            self.loaded_bytes += len(data)
+        return data
+
+    def __len__(self) -> int:
+        return len(self.__chunks)
+
+    def __contains__(self, reference: object) -> bool:
+        return reference in self.__chunks
+
+
+class FileSystemStorageHandler:
+    """
+    A content addressed chunk store in a local directory that stands in for Bee.
+
+    Every saved data is written into its own file, sharded into subdirectories by the first byte of
+    its reference. Files are written under a temporary name and renamed atomically, so any number of
+    threads and processes can read and write the same directory. References are calculated the
+    same way as Bee does.
+
+    Attributes:
+        path (str): Path of the store directory.
+        save_count (int): Number of `save` calls of this instance.
+        saved_bytes (int): Summed size of the data saved by this instance in bytes.
+        load_count (int): Number of `load` calls of this instance.
+        loaded_bytes (int): Summed size of the data loaded by this instance in bytes.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+        self.save_count = 0
+        self.saved_bytes = 0
+        self.load_count = 0
+        self.loaded_bytes = 0
+        self.__lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def __chunk_path(self, reference: Reference) -> str:
+        reference_hex = bytes(reference).hex()
+        return os.path.join(self.path, reference_hex[:2], reference_hex[2:])
+
+    def save(self, data: bytes) -> Reference:
+        data = bytes(data)
+        reference = file_address(data)
+        chunk_path = self.__chunk_path(reference)
+
+        # * content addressed data never changes, an existing file is not written again
+        if not os.path.exists(chunk_path):
+            shard_path = os.path.dirname(chunk_path)
+            os.makedirs(shard_path, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=shard_path, prefix=".tmp-")
+            try:
+                with os.fdopen(file_descriptor, "wb") as file:
+                    file.write(data)
+                os.replace(temporary_path, chunk_path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+
+        with self.__lock:
+            self.save_count += 1
+            self.saved_bytes += len(data)
+        return reference
+
+    def load(self, reference: Reference) -> bytes:
+        """
+        Raises:
+        KeyError: If nothing has been saved under the reference.
+        """
+        try:
+            with open(self.__chunk_path(reference), "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            with self.__lock:
+                self.load_count += 1
+            raise KeyError(bytes(reference).hex()) from None
+
+        with self.__lock:
+            self.load_count += 1
+            self.loaded_bytes += len(data)
+        return data
+
+    def __contains__(self, reference: object) -> bool:
+        return isinstance(reference, bytes) and os.path.exists(self.__chunk_path(reference))
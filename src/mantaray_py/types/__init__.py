@@ -1,18 +1,31 @@
+from typing import TYPE_CHECKING, Any
+
 from mantaray_py.types.get_random_values import get_random_values
 from mantaray_py.types.types import (
+    AsyncStorageLoader,
+    AsyncStorageSaver,
+    BatchStorageSaver,
+    ManifestChange,
+    ManifestEntry,
     MarshalVersion,
     MetadataMapping,
+    MetricsObserver,
     NodeType,
     Reference,
-    StorageHandler,
     StorageLoader,
     StorageSaver,
     marshal_version_values,
 )
 
 __all__ = [
+    "AsyncStorageLoader",
+    "AsyncStorageSaver",
+    "BatchStorageSaver",
+    "ManifestChange",
+    "ManifestEntry",
     "MarshalVersion",
     "MetadataMapping",
+    "MetricsObserver",
     "NodeType",
     "Reference",
     "StorageHandler",
@@ -21,3 +34,16 @@ __all__ = [
     "get_random_values",
     "marshal_version_values",
 ]
+
+if TYPE_CHECKING:
+    from mantaray_py.types.storage_handler import StorageHandler
+
+
+def __getattr__(name: str) -> Any:
+    # * StorageHandler is a pydantic model, pydantic is only imported once it is used
+    if name == "StorageHandler":
+        from mantaray_py.types.storage_handler import StorageHandler  # noqa: PLC0415
+
+        return StorageHandler
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from mantaray_py.types.types import StorageLoader, StorageSaver
+
+
+class StorageHandler(BaseModel):
+    load: StorageLoader
+    save: StorageSaver
@@ -1,7 +1,6 @@
+from collections.abc import Awaitable
 from enum import Enum
-from typing import Callable
-
-from pydantic import BaseModel
+from typing import Callable, Optional
 
 marshal_version_values: tuple[str, str] = ("0.1", "0.2")
 
@@ -21,11 +20,17 @@ Reference = bytes
 
 MetadataMapping = dict[str, str]
 
+# * (path, entry, metadata) of a manifest entry
+ManifestEntry = tuple[bytes, Reference, Optional[MetadataMapping]]
+# * (path, entry, metadata) of a change of a manifest, a `None` entry removes the path
+ManifestChange = tuple[bytes, Optional[Reference], Optional[MetadataMapping]]
+
 
 StorageLoader = Callable[[Reference], bytes]
 StorageSaver = Callable
-
-
-class StorageHandler(BaseModel):
-    load: StorageLoader
-    save: StorageSaver
+# * Saves a list of serialised chunks at once and returns their references in the same order
+BatchStorageSaver = Callable[[list[bytes]], list[Reference]]
+AsyncStorageLoader = Callable[[Reference], Awaitable[bytes]]
+AsyncStorageSaver = Callable[[bytes], Awaitable[Reference]]
+# * Called with (event, seconds, size in bytes) after an instrumented operation, see mantaray_py.metrics
+MetricsObserver = Callable[[str, float, int], None]
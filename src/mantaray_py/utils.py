@@ -1,44 +1,82 @@
+from collections.abc import Iterator
 from typing import Callable, Optional, Union
 
-from eth_utils import keccak
-from pydantic import BaseModel, ConfigDict, Field
+from eth_hash.auto import keccak
 
+from mantaray_py.metrics import ENCRYPT_DECRYPT, timed
 from mantaray_py.types import Reference, get_random_values
 
 BYTES_LENGTH = 32
 
 
-class IndexBytes(BaseModel):
-    bytes_data: bytearray = Field(bytearray(32), min_length=BYTES_LENGTH, max_length=BYTES_LENGTH)
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+class IndexBytes:
+    """
+    Bitmap of the fork indices of a node.
+
+    The bitmap is backed by a 256 bit integer. Byte `i` is present if bit `i % 8` of the byte `i // 8`
+    is set in the serialised 32 bytes, which is the little endian representation of the integer.
+    """
+
+    __slots__ = ("bitmap",)
+
+    def __init__(self, bitmap: int = 0) -> None:
+        self.bitmap = bitmap
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IndexBytes":
+        """Creates the bitmap from its 32 bytes serialisation."""
+        if len(data) != BYTES_LENGTH:
+            msg = f"Cannot set given bytes, because it does not have {BYTES_LENGTH} length. Got {len(data)}"
+            raise ValueError(msg)
+        return cls(int.from_bytes(data, "little"))
+
+    @property
+    def bytes_data(self) -> bytes:
+        """The 32 bytes serialisation. It is read-only, the bitmap is changed by `set_byte` and `set_bytes`."""
+        return self.get_bytes()
 
     def set_byte(self, byte: int) -> None:
         """Set a byte value."""
         if byte > 255:  # noqa: PLR2004
             msg = f"IndexBytes setByte error: {byte} is greater than 255"
             raise ValueError(msg)
-        self.bytes_data[byte // 8] |= 1 << byte % 8
+        self.bitmap |= 1 << byte
 
     def set_bytes(self, byte_array: bytearray) -> None:
         check_bytes(byte_array, 32)
-        self.bytes_data = byte_array
+        self.bitmap = int.from_bytes(byte_array, "little")
 
     def get_bytes(self) -> bytes:
-        return bytes(self.bytes_data)
+        return self.bitmap.to_bytes(BYTES_LENGTH, "little")
 
     def check_byte_present(self, byte: int) -> bool:
         """Check if a byte is present."""
-        return (self.bytes_data[byte // 8] >> byte % 8) & 1 > 0
+        return (self.bitmap >> byte) & 1 > 0
+
+    def popcount(self) -> int:
+        """Number of present bytes."""
+        return bin(self.bitmap).count("1")
+
+    def __len__(self) -> int:
+        return self.popcount()
+
+    def __iter__(self) -> Iterator[int]:
+        """Yields the present bytes in ascending order."""
+        bitmap = self.bitmap
+        while bitmap:
+            lowest_bit = bitmap & -bitmap
+            yield lowest_bit.bit_length() - 1
+            bitmap ^= lowest_bit
 
     def for_each(self, hook: Callable[[int], None]) -> None:
         """Iterate through the indexed byte values."""
-        for i in range(256):
-            if self.check_byte_present(i):
-                hook(i)
+        for byte in self:
+            hook(byte)
 
 
-def check_reference(ref: Union[Reference, bytes]) -> None:
-    if not isinstance(ref, bytes):
+def check_reference(ref: Union[Reference, bytes, memoryview]) -> None:
+    # * memoryview slices of a loaded chunk are accepted, the nodes materialise them on read
+    if not isinstance(ref, (bytes, memoryview)):
         msg = "Given Reference is not a valid bytes instance"
         raise TypeError(msg)
     if len(ref) not in {32, 64}:
@@ -151,6 +189,7 @@ def equal_bytes(a: bytes, b: bytes) -> bool:
     return all(a[i] == b[i] for i in range(len(a)))
 
 
+@timed(ENCRYPT_DECRYPT, lambda _, args: len(args[1]))
 def encrypt_decrypt(
     key: bytes, data: bytes, start_index: Optional[int] = 0, end_index: Optional[int] = None
 ) -> Optional[bytes]:
@@ -170,18 +209,41 @@ def encrypt_decrypt(
     if key == bytes(BYTES_LENGTH):
         return data
 
+    buffer = bytearray(data)
+    encrypt_decrypt_into(key, buffer, start_index or 0, end_index)
+    return buffer  # type: ignore
+
+
+def encrypt_decrypt_into(
+    key: bytes, buffer: Union[bytearray, memoryview], start_index: int = 0, end_index: Optional[int] = None
+) -> None:
+    """
+    In-place variant of `encrypt_decrypt`, the XOR operation overwrites the bytes of `buffer`.
+
+    The whole range is XORed at once as one big integer against the repeated key. Like in
+    `encrypt_decrypt`, the range is processed in key sized blocks, so the last block is XORed
+    completely even if it runs past `end_index`.
+
+    Args:
+        key (bytes): The byte array used as the key.
+        buffer (Union[bytearray, memoryview]): Writable buffer to be encrypted or decrypted.
+        start_index (int, optional): The starting index in `buffer` where the operation should start. Defaults to 0.
+        end_index (int, optional): The ending index in `buffer` where the operation should end. Defaults to None,
+        which means the operation will go until the end of `buffer`.
+    """
     if end_index is None:
-        end_index = len(data)
+        end_index = len(buffer)
 
-    data = bytearray(data)
-    for i in range(start_index, end_index, len(key)):  # type: ignore
-        max_chunk_index = i + len(key)
-        encryption_chunk_end_index = min(max_chunk_index, len(data))
-        encryption_chunk = data[i:encryption_chunk_end_index]
-        for j in range(len(encryption_chunk)):
-            encryption_chunk[j] ^= key[j % len(key)]
-        data[i:encryption_chunk_end_index] = encryption_chunk
-    return data
+    key_length = len(key)
+    block_count = -(-(end_index - start_index) // key_length)
+    stop_index = min(start_index + block_count * key_length, len(buffer))
+    length = stop_index - start_index
+    if length <= 0:
+        return
+
+    key_stream = (key * (length // key_length + 1))[:length]
+    xored = int.from_bytes(buffer[start_index:stop_index], "little") ^ int.from_bytes(key_stream, "little")
+    buffer[start_index:stop_index] = xored.to_bytes(length, "little")
 
 
 def keccak256_hash(*messages: Union[str, bytes, bytearray]) -> bytes:
@@ -195,7 +257,7 @@ def keccak256_hash(*messages: Union[str, bytes, bytearray]) -> bytes:
     """
 
     if isinstance(messages, str):
-        return keccak(text=messages)
+        return keccak(messages.encode())
 
     combined = bytearray()
     for message in messages:
@@ -204,7 +266,7 @@ def keccak256_hash(*messages: Union[str, bytes, bytearray]) -> bytes:
             raise TypeError(msg)
         combined += message
 
-    return keccak(combined)  # type: ignore
+    return keccak(combined)
 
 
 def gen_32_bytes() -> bytes:
@@ -232,12 +294,23 @@ def common(a: bytes, b: bytes) -> bytes:
     Returns:
         bytes: The common bytes of `a` and `b` until the first byte difference.
     """
-    common_bytes = bytearray()
+    return bytes(a[: common_prefix_length(a, b)])
 
-    for byte_a, byte_b in zip(a, b):
-        if byte_a == byte_b:
-            common_bytes.append(byte_a)
-        else:
-            break
 
-    return bytes(common_bytes)
+def common_prefix_length(a: bytes, b: bytes) -> int:
+    """
+    Returns the length of the common prefix of the two given byte arrays.
+
+    The bytes are compared at once as big endian integers, the first difference is given by
+    the highest set bit of their XOR.
+
+    Args:
+        a (bytes): The first byte array.
+        b (bytes): The second byte array.
+
+    Returns:
+        int: The number of leading bytes that are equal in `a` and `b`.
+    """
+    length = min(len(a), len(b))
+    difference = int.from_bytes(a[:length], "big") ^ int.from_bytes(b[:length], "big")
+    return length - (difference.bit_length() + 7) // 8
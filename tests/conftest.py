@@ -130,7 +130,7 @@ def get_cache_debug_postage_stamp(request, bee_debug_ky_options) -> BatchId:
     return stamp
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def get_debug_postage(get_cache_debug_postage_stamp) -> BatchId:
     print("[*]Getting Debug Postage....")
     # return "f51d93f4317c30754b16717d6f85e8ddad968c8b1d536beafe37acfb57f23341"
@@ -1,10 +1,29 @@
+import asyncio
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import pytest
 from rich.console import Console
 
-from mantaray_py import (MantarayNode, check_for_separator, gen_32_bytes,
-                         init_manifest_node)
+from mantaray_py import (CachingStorageLoader, DiskCachingStorageLoader,
+                         FileSystemStorageHandler, InMemoryStorageHandler,
+                         ManifestMetrics, MantarayFork, MantarayNode,
+                         StreamingManifestBuilder,
+                         async_load_all_nodes, check_for_separator,
+                         chunk_address, diff, file_address, file_addresses,
+                         gen_32_bytes, init_manifest_node, keccak256_hash,
+                         load_all_nodes)
+from mantaray_py.metrics import (DESERIALISE, ENCRYPT_DECRYPT, JSON,
+                                 OBSERVERS, SERIALISE, STORAGE_LOAD,
+                                 STORAGE_SAVE)
 from mantaray_py.node import NotFoundError
+from mantaray_py.utils import (IndexBytes, encrypt_decrypt,
+                               encrypt_decrypt_into)
 
+PROJECT_DIR = Path(__file__).resolve().parent.parent
 console = Console()
 
 
@@ -125,3 +144,925 @@ def test_remove_forks(get_sample_mantaray_node):
 
     # * 'm' key of prefix table disappeared
     assert list(check_node1.forks.keys()) == [path1[13]]
+
+
+def test_load_resolves_forks_only_on_the_looked_up_path(get_sample_mantaray_node):
+    sample_node = get_sample_mantaray_node
+    node = sample_node["node"]
+    path1 = sample_node["paths"][0]
+    path2 = sample_node["paths"][1]
+    path3 = sample_node["paths"][2]
+
+    storage = {}
+    loaded = []
+
+    def save_function(data: bytes) -> bytes:
+        reference = keccak256_hash(data)
+        storage[reference] = data
+        return reference
+
+    def load_function(reference: bytes) -> bytes:
+        loaded.append(reference)
+        return storage[reference]
+
+    reference = node.save(save_function)
+
+    lazy_node = MantarayNode()
+    lazy_node.load(load_function, reference)
+    assert len(loaded) == 1
+
+    # * root -> 'path' -> '1/valami' -> '/' -> 'masodik' -> '.ext'
+    fork = lazy_node.get_fork_at_path(path3)
+    assert len(loaded) == 6
+    assert fork.node.get_entry() == node.get_fork_at_path(path3).node.get_entry()
+
+    assert lazy_node.get_fork_at_path(path1).node.get_metadata() == {"vmi": "elso"}
+    assert len(loaded) == 7
+
+    # * untouched forks are not loaded again on save
+    node.remove_path(path2)
+    lazy_node.remove_path(path2)
+    assert lazy_node.save(save_function) == node.save(save_function)
+    assert len(loaded) == 7
+
+
+@pytest.mark.asyncio
+async def test_async_save_and_load_all_nodes(get_sample_mantaray_node):
+    sample_node = get_sample_mantaray_node
+    node = sample_node["node"]
+    path3 = sample_node["paths"][2]
+
+    storage = {}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def save_function(data: bytes) -> bytes:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        reference = keccak256_hash(data)
+        storage[reference] = data
+        return reference
+
+    async def load_function(reference: bytes) -> bytes:
+        await asyncio.sleep(0)
+        return storage[reference]
+
+    reference = await node.async_save(save_function, max_concurrency=2)
+    assert max_in_flight <= 2
+    assert reference == node.get_content_address()
+
+    node_again = MantarayNode()
+    await node_again.async_load(load_function, reference)
+    await async_load_all_nodes(load_function, node_again)
+
+    assert node_again.get_fork_at_path(path3).node.get_entry() == node.get_fork_at_path(path3).node.get_entry()
+    assert node_again.serialise() == node.serialise()
+
+
+@pytest.mark.asyncio
+async def test_async_save_keeps_the_forks_that_are_not_loaded():
+    entries = [(b"a/1", gen_32_bytes(), None), (b"a/2", gen_32_bytes(), None), (b"b", gen_32_bytes(), None)]
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries(entries).save(storage.save)
+
+    async def save_function(data: bytes) -> bytes:
+        return storage.save(data)
+
+    async def load_function(reference: bytes) -> bytes:
+        return storage.load(reference)
+
+    node = MantarayNode()
+    await node.async_load(load_function, reference)
+    assert await node.async_save(save_function) == reference
+
+    entries.append((b"c", gen_32_bytes(), None))
+    node.add_fork(*entries[-1])
+    loads = storage.load_count
+    assert await node.async_save(save_function) == MantarayNode.from_entries(entries).save(storage.save)
+    assert storage.load_count == loads
+
+
+def test_save_with_thread_pool_matches_sequential_save(get_sample_mantaray_node):
+    sample_node = get_sample_mantaray_node
+    node = sample_node["node"]
+    path2 = sample_node["paths"][1]
+
+    storage = {}
+
+    def save_function(data: bytes) -> bytes:
+        reference = keccak256_hash(data)
+        storage[reference] = data
+        return reference
+
+    sequential_node = MantarayNode()
+    sequential_node.set_entry(node.get_entry())
+    for path in sample_node["paths"]:
+        fork = node.get_fork_at_path(path)
+        sequential_node.add_fork(path, fork.node.get_entry(), fork.node.get_metadata())
+
+    reference = node.save(save_function, max_workers=4)
+    assert reference == node.get_content_address()
+    assert reference == sequential_node.save(save_function)
+
+    # * only the modified path is saved again
+    node.remove_path(path2)
+    saved = []
+
+    def counting_save_function(data: bytes) -> bytes:
+        saved.append(data)
+        return save_function(data)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reference_after_remove = node.save(counting_save_function, executor=executor)
+
+    sequential_node.remove_path(path2)
+    assert reference_after_remove == sequential_node.save(save_function)
+    # * root -> 'path' -> '1/valami' -> '/'
+    assert len(saved) == 4
+
+
+def test_save_with_batch_storage_saver(get_sample_mantaray_node):
+    sample_node = get_sample_mantaray_node
+    node = sample_node["node"]
+
+    storage = {}
+    batches = []
+
+    def batch_save_function(chunks: list[bytes]) -> list[bytes]:
+        batches.append(len(chunks))
+        references = [keccak256_hash(data) for data in chunks]
+        storage.update(zip(references, chunks))
+        return references
+
+    reference = node.save(batch_storage_saver=batch_save_function)
+
+    # * one call per level: the 3 leaves, 'masodik', '/', '1/valami', 'path' and the root
+    assert batches == [3, 1, 1, 1, 1, 1]
+    assert reference == node.get_content_address()
+
+    node_again = MantarayNode()
+    node_again.load(lambda ref: storage[ref], reference)
+    load_all_nodes(lambda ref: storage[ref], node_again)
+    assert node_again.serialise() == node.serialise()
+
+    node.make_dirty()
+    with pytest.raises(ValueError):
+        node.save(batch_storage_saver=lambda chunks: [])
+
+
+def test_caching_storage_loader_evicts_least_recently_used_chunks():
+    storage = {bytes([i]) * 32: bytes([i]) * 100 for i in range(4)}
+    loaded = []
+
+    def load_function(reference: bytes) -> bytes:
+        loaded.append(reference)
+        return storage[reference]
+
+    cache = CachingStorageLoader(load_function, max_size=250)
+    ref0, ref1, ref2, _ = storage
+
+    assert cache(ref0) == storage[ref0]
+    assert cache(ref1) == storage[ref1]
+    assert cache(ref0) == storage[ref0]
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 2, 0)
+
+    # * ref1 is the least recently used one
+    cache(ref2)
+    assert cache.evictions == 1
+    assert ref1 not in cache
+    assert ref0 in cache
+    assert cache.size == 200
+
+    cache(ref1)
+    assert loaded == [ref0, ref1, ref2, ref1]
+
+
+def test_caching_storage_loader_serves_repeated_manifest_loads(get_sample_mantaray_node):
+    node = get_sample_mantaray_node["node"]
+    storage = {}
+
+    def save_function(data: bytes) -> bytes:
+        reference = keccak256_hash(data)
+        storage[reference] = data
+        return reference
+
+    reference = node.save(save_function)
+    cache = CachingStorageLoader(lambda ref: storage[ref])
+
+    for _ in range(2):
+        node_again = MantarayNode()
+        node_again.load(cache, reference)
+        load_all_nodes(cache, node_again)
+
+    assert cache.misses == len(storage)
+    assert node_again.serialise() == node.serialise()
+
+
+def test_disk_caching_storage_loader_survives_reopening(tmp_path):
+    storage = {bytes([i]) * 32: bytes([i]) * 100 for i in range(4)}
+    loaded = []
+
+    def load_function(reference: bytes) -> bytes:
+        loaded.append(reference)
+        return storage[reference]
+
+    ref0, ref1, ref2, ref3 = storage
+    cache_path = tmp_path / "chunks.sqlite"
+
+    with DiskCachingStorageLoader(load_function, cache_path, max_size=250) as cache:
+        cache(ref0)
+        cache(ref1)
+        assert cache(ref0) == storage[ref0]
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    with DiskCachingStorageLoader(load_function, cache_path, max_size=250) as cache:
+        assert cache(ref1) == storage[ref1]
+        assert cache(ref0) == storage[ref0]
+        assert (cache.hits, cache.misses) == (2, 0)
+
+        # * ref1 is the least recently used one
+        cache(ref2)
+        assert cache.evictions == 1
+        assert cache.size == 200
+        cache(ref1)
+
+    assert loaded == [ref0, ref1, ref2, ref1]
+
+
+@pytest.mark.parametrize(
+    "data_length, start_index, end_index",
+    [(4096, 32, None), (100, 32, None), (100, 32, 50), (100, 0, 10), (31, 32, None), (64, 40, 40)],
+)
+def test_encrypt_decrypt_matches_blockwise_xor(data_length, start_index, end_index):
+    key = gen_32_bytes()
+    data = gen_32_bytes() * (data_length // 32 + 1)
+    data = data[:data_length]
+
+    expected = bytearray(data)
+    stop_index = len(data) if end_index is None else end_index
+    for i in range(start_index, stop_index, len(key)):
+        for j in range(i, min(i + len(key), len(data))):
+            expected[j] ^= key[j - i]
+
+    assert encrypt_decrypt(key, data, start_index, end_index) == expected
+
+    buffer = bytearray(data)
+    encrypt_decrypt_into(key, memoryview(buffer), start_index, end_index)
+    assert buffer == expected
+    assert encrypt_decrypt(key, bytes(expected), start_index, end_index) == data
+
+
+def test_index_bytes_iterates_set_bits_in_order():
+    index = IndexBytes()
+    for byte in (255, 9, 0, 47):
+        index.set_byte(byte)
+
+    assert list(index) == [0, 9, 47, 255]
+    assert index.popcount() == len(index) == 4
+    assert index.check_byte_present(47)
+    assert not index.check_byte_present(46)
+
+    serialised = index.get_bytes()
+    assert serialised[0] == 0b1
+    assert serialised[1] == 0b10
+    assert serialised[5] == 0b10000000
+    assert serialised[31] == 0b10000000
+    assert list(IndexBytes.from_bytes(serialised)) == [0, 9, 47, 255]
+
+    visited = []
+    index.for_each(visited.append)
+    assert visited == [0, 9, 47, 255]
+
+    with pytest.raises(ValueError):
+        index.set_byte(256)
+
+    # * the serialisation is a snapshot of the bitmap, writing into it fails instead of being lost
+    assert index.bytes_data == serialised
+    with pytest.raises(TypeError):
+        index.bytes_data[0] |= 0b10
+    assert not index.check_byte_present(1)
+
+
+def test_deserialise_keeps_views_of_an_obfuscated_chunk():
+    obfuscation_key = gen_32_bytes()
+    node = init_manifest_node({"obfuscationKey": obfuscation_key})
+    node.add_fork(b"index.html", gen_32_bytes(), {"Content-Type": "text/html"})
+    node.add_fork(b"img/logo.png", gen_32_bytes())
+    node.save(keccak256_hash)
+    serialised = node.serialise()
+
+    new_node = MantarayNode()
+    new_node.deserialise(memoryview(serialised))
+    assert new_node.get_obfuscation_key() == obfuscation_key
+
+    fork = new_node.forks[ord("i")]
+    # * the prefix and the entry are views of the decrypted chunk until they are first read
+    assert type(fork._MantarayFork__prefix) is memoryview
+    assert type(fork.node._MantarayNode__entry) is memoryview
+    assert type(fork.prefix) is bytes
+    assert fork.prefix == node.forks[ord("i")].prefix
+    assert type(fork.node.get_entry()) is bytes
+    assert fork.node.get_entry() is fork.node.get_entry()
+    assert fork.node.get_entry() == node.forks[ord("i")].node.get_content_address()
+
+    for fork in new_node.forks.values():
+        fork.node.set_content_address(fork.node.get_entry())
+    assert new_node.serialise() == serialised
+
+
+def test_loaded_metadata_is_decoded_on_first_access(monkeypatch):
+    node = init_manifest_node()
+    node.add_fork(b"index.html", gen_32_bytes(), {"Content-Type": "text/html; charset=utf-8"})
+    node.add_fork(b"style.css", gen_32_bytes(), {"Content-Type": "text/css", "Filename": "website-style.css"})
+    node.save(keccak256_hash)
+    serialised = node.serialise()
+
+    decoded = []
+    json_loads = json.loads
+    monkeypatch.setattr(json, "loads", lambda data: decoded.append(data) or json_loads(data))
+
+    new_node = MantarayNode()
+    new_node.deserialise(serialised)
+    for fork in new_node.forks.values():
+        fork.node.set_content_address(fork.node.get_entry())
+
+    assert new_node.serialise() == serialised
+    assert decoded == []
+
+    fork = new_node.forks[ord("i")]
+    assert fork.node.get_metadata() == {"Content-Type": "text/html; charset=utf-8"}
+    assert len(decoded) == 1
+    assert fork.node.get_serialised_metadata() is None
+    assert new_node.serialise() == serialised
+
+    fork.node.get_metadata()["Content-Type"] = "text/plain"
+    assert new_node.serialise() != serialised
+    assert new_node.forks[ord("s")].node.get_serialised_metadata() is not None
+
+    # * the serialised website keys are decoded at once, they make the node a value type
+    website_node = MantarayNode()
+    website_node.set_metadata(b'{"website-error-document": "404.html"}')
+    assert website_node.is_value_type()
+    assert website_node.get_serialised_metadata() is None
+
+
+def test_from_entries_matches_sorted_add_fork():
+    long_directory = b"a/very/long/directory/name/that/does/not/fit/into/one/prefix/"
+    entries = [
+        (b"path1/valami/masodik", gen_32_bytes(), None),
+        (b"path1/valami/elso", gen_32_bytes(), {"vmi": "elso"}),
+        (long_directory + b"file.txt", gen_32_bytes(), {"Content-Type": "text/plain"}),
+        (b"path1/valami", gen_32_bytes(), {"vmi": "negy"}),
+        (b"path1/valami/masodik.ext", gen_32_bytes(), None),
+        (long_directory + b"other.txt", gen_32_bytes(), None),
+        (b"path2", gen_32_bytes(), None),
+        (b"path1/valami/elso", gen_32_bytes(), {}),
+        (b"", gen_32_bytes(), {"website-index-document": "path2"}),
+    ]
+    obfuscation_key = gen_32_bytes()
+
+    node = init_manifest_node({"obfuscationKey": obfuscation_key})
+    for path, entry, metadata in sorted(entries, key=lambda entry: entry[0]):
+        node.add_fork(path, entry, metadata)
+    built = MantarayNode.from_entries(entries, obfuscation_key)
+
+    saved, built_saved = [], []
+    reference = node.save(lambda data: saved.append(data) or keccak256_hash(data))
+    built_reference = built.save(lambda data: built_saved.append(data) or keccak256_hash(data))
+    assert built_reference == reference
+    assert sorted(built_saved) == sorted(saved)
+    assert built.get_fork_at_path(b"path1/valami/elso").node.get_entry() == entries[7][1]
+
+    with pytest.raises(ValueError):
+        MantarayNode.from_entries(entries, presorted=True)
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_streaming_manifest_builder_matches_from_entries(max_workers):
+    entries = sorted(
+        (f"dir-{index % 7}/{'sub/' * (index % 3)}file-{index}.txt".encode(), gen_32_bytes(), {"index": str(index)})
+        for index in range(200)
+    )
+    entries.append((entries[-1][0] + b"/long/path/under/a/file/that/needs/more/than/one/prefix", gen_32_bytes(), None))
+    obfuscation_key = gen_32_bytes()
+
+    saved = []
+    reference = MantarayNode.from_entries(entries, obfuscation_key).save(
+        lambda data: saved.append(data) or keccak256_hash(data)
+    )
+
+    streamed = []
+    executor = ThreadPoolExecutor(max_workers) if max_workers else None
+    builder = StreamingManifestBuilder(
+        lambda data: streamed.append(data) or keccak256_hash(data), obfuscation_key, executor
+    )
+    builder.add_entries(entries)
+    assert builder.finish() == reference
+    if executor:
+        executor.shutdown()
+    assert sorted(streamed) == sorted(saved)
+    assert builder.entry_count == len(entries)
+
+    builder = StreamingManifestBuilder(keccak256_hash)
+    builder.add(b"b", gen_32_bytes())
+    with pytest.raises(ValueError):
+        builder.add(b"a", gen_32_bytes())
+
+
+def test_iter_entries_walks_a_loaded_manifest_lazily():
+    entries = sorted(
+        [
+            (b"", gen_32_bytes(), None),
+            (b"index.html", gen_32_bytes(), {"Content-Type": "text/html"}),
+            (b"img/logo.png", gen_32_bytes(), None),
+            (b"img/icons/a.svg", gen_32_bytes(), None),
+            (b"img/icons/b.svg", gen_32_bytes(), None),
+            (b"img", gen_32_bytes(), None),
+            (b"style.css", gen_32_bytes(), None),
+        ]
+    )
+    node = MantarayNode.from_entries(entries)
+    assert [(path, entry) for path, entry, _ in node.iter_entries()] == [(path, entry) for path, entry, _ in entries]
+
+    storage = {}
+    loaded = []
+
+    def save_function(data: bytes) -> bytes:
+        reference = keccak256_hash(data)
+        storage[reference] = data
+        return reference
+
+    def load_function(reference: bytes) -> bytes:
+        loaded.append(reference)
+        return storage[reference]
+
+    lazy_node = MantarayNode()
+    lazy_node.load(load_function, node.save(save_function))
+    loaded.clear()
+
+    walked = list(lazy_node.iter_entries())
+    assert [(path, entry, metadata or {}) for path, entry, metadata in walked] == [
+        (path, entry, metadata or {}) for path, entry, metadata in entries
+    ]
+    loaded_count = len(loaded)
+
+    # * the fetched nodes are not kept, a second walk loads them again
+    assert list(lazy_node.iter_entries()) == walked
+    assert len(loaded) == 2 * loaded_count
+
+    loaded.clear()
+    assert [path for path, _, _ in lazy_node.iter_entries(b"img/i")] == [b"img/icons/a.svg", b"img/icons/b.svg"]
+    assert len(loaded) < loaded_count
+
+    loaded.clear()
+    first_entries = lazy_node.iter_entries()
+    assert next(first_entries)[0] == b""
+    assert next(first_entries)[0] == b"img"
+    assert len(loaded) < loaded_count
+
+
+def test_file_addresses_reproduce_the_bee_reference_of_testpage():
+    test_dir = PROJECT_DIR / "data" / "testpage"
+    index_reference, image_reference, text_reference = file_addresses(
+        [test_dir / "index.html", test_dir / "img" / "icon.png", test_dir / "img" / "icon.png.txt"], max_workers=2
+    )
+
+    node = MantarayNode()
+    node.add_fork(
+        b"index.html", index_reference, {"Content-Type": "text/html; charset=utf-8", "Filename": "index.html"}
+    )
+    node.add_fork(b"img/icon.png.txt", text_reference, {"Content-Type": "", "Filename": "icon.png.txt"})
+    node.add_fork(b"img/icon.png", image_reference, {"Content-Type": "image/png", "Filename": "icon.png"})
+    node.add_fork(b"/", bytes(32), {"website-index-document": "index.html"})
+
+    # * manifest chunks are uploaded as data, so their reference is calculated the same way
+    assert node.save(file_address).hex() == "e9d46950cdb17e15d0b3712bcb325724a3107560143d65a7acd00ea781eb9cd7"
+
+
+def test_file_address_carries_up_the_last_lonely_chunk():
+    data = bytes(range(256)) * 16 * 129 + b"tail"
+    chunks = [data[offset : offset + 4096] for offset in range(0, len(data), 4096)]
+    addresses = [chunk_address(chunk) for chunk in chunks]
+    assert len(addresses) == 130
+
+    # * 128 chunks fill the first intermediate chunk, the last two go into the second one
+    first = chunk_address(b"".join(addresses[:128]), 128 * 4096)
+    second = chunk_address(b"".join(addresses[128:]), 4096 + 4)
+    assert file_address(data) == chunk_address(first + second, len(data))
+
+    # * with 129 chunks the last one is not wrapped into an intermediate chunk of its own
+    data = data[: 129 * 4096]
+    assert file_address(data) == chunk_address(first + addresses[128], len(data))
+    assert file_address(b"tail") == chunk_address(b"tail")
+
+
+@pytest.mark.parametrize("storage_kind", ["memory", "filesystem"])
+def test_storage_handlers_save_and_load_manifests(storage_kind, tmp_path, get_sample_mantaray_node):
+    node = get_sample_mantaray_node["node"]
+    storage = InMemoryStorageHandler() if storage_kind == "memory" else FileSystemStorageHandler(tmp_path)
+
+    reference = node.save(storage.save)
+    # * the identical leaf nodes are saved into the same chunk
+    assert storage.save_count == 8
+    assert reference == file_address(node.serialise())
+    assert reference in storage
+
+    loaded_node = MantarayNode()
+    loaded_node.load(storage.load, reference)
+    load_all_nodes(storage.load, loaded_node)
+    assert loaded_node.get_fork_at_path(b"path1/valami").node.get_metadata() == {"vmi": "negy"}
+    assert storage.load_count == 8
+    assert storage.loaded_bytes == storage.saved_bytes
+
+    with ThreadPoolExecutor(8) as executor:
+        references = list(executor.map(storage.save, [b"chunk"] * 32 + [b"other chunk"] * 32))
+    assert set(references) == {file_address(b"chunk"), file_address(b"other chunk")}
+    assert storage.load(file_address(b"chunk")) == b"chunk"
+
+    with pytest.raises(KeyError):
+        storage.load(bytes(32))
+
+    if storage_kind == "filesystem":
+        assert FileSystemStorageHandler(tmp_path).load(reference) == storage.load(reference)
+
+
+def test_metrics_observe_storage_calls_and_hot_paths(get_sample_mantaray_node):
+    node = get_sample_mantaray_node["node"]
+    storage = InMemoryStorageHandler()
+    metrics = ManifestMetrics()
+
+    with metrics.observe():
+        reference = node.save(storage.save)
+        loaded_node = MantarayNode()
+        loaded_node.load(storage.load, reference)
+        load_all_nodes(storage.load, loaded_node)
+        assert loaded_node.get_fork_at_path(b"path1/valami").node.get_metadata() == {"vmi": "negy"}
+    assert not OBSERVERS
+
+    assert metrics[STORAGE_SAVE].calls == storage.save_count == 8
+    assert metrics[STORAGE_SAVE].bytes == storage.saved_bytes
+    assert metrics[STORAGE_LOAD].calls == storage.load_count == 8
+    assert metrics[STORAGE_LOAD].bytes == storage.loaded_bytes
+    assert 0 < metrics[STORAGE_LOAD].max_seconds <= metrics[STORAGE_LOAD].seconds
+    assert metrics[SERIALISE].calls == metrics[DESERIALISE].calls == 8
+    assert metrics[ENCRYPT_DECRYPT].calls == 16
+    # * two forks with metadata are serialised, one of them is decoded after the load
+    assert metrics[JSON].calls == 3
+
+    # * nothing is reported once the observer is unregistered
+    node.make_dirty()
+    node.save(storage.save)
+    assert metrics[STORAGE_SAVE].calls == 8
+
+
+def test_import_has_no_side_effects_or_heavy_imports():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys, mantaray_py; print(sys.excepthook is sys.__excepthook__)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "True"
+
+    # * every imported module is a line of "import time: self [us] | cumulative | module" on stderr
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if "|" in line}
+    assert "mantaray_py" in imported
+    for heavy_module in ["rich", "pydantic", "eth_utils", "asyncio", "multiprocessing", "sqlite3"]:
+        assert heavy_module not in imported
+
+
+def test_save_only_visits_changed_paths():
+    entries = [(f"dir-{i % 10}/sub-{i % 7}/file-{i}.txt".encode(), gen_32_bytes(), None) for i in range(300)]
+    storage = InMemoryStorageHandler()
+    node = MantarayNode.from_entries(entries)
+    reference = node.save(storage.save)
+
+    loaded_node = MantarayNode()
+    loaded_node.load(storage.load, reference)
+    path = b"dir-3/sub-2/file-23.txt"
+    fork = loaded_node.get_fork_at_path(path)
+    nodes_on_path, rest = 1, path
+    node = loaded_node
+    while rest:
+        node_fork = node.forks[rest[0]]
+        node, rest = node_fork.node, rest[len(node_fork.prefix) :]
+        nodes_on_path += 1
+    # * resolving the forks along the path does not change anything
+    assert not loaded_node.is_dirty()
+    assert loaded_node.save(storage.save) == reference
+    assert storage.save_count == len(storage)
+
+    # * an entry set on a deep node makes the nodes dirty up to the root
+    new_entry = gen_32_bytes()
+    fork.node.set_entry(new_entry)
+    assert loaded_node.is_dirty()
+    loads, saves = storage.load_count, storage.save_count
+    new_reference = loaded_node.save(storage.save)
+    assert storage.load_count == loads
+    assert storage.save_count - saves == nodes_on_path
+
+    entries[23] = (entries[23][0], new_entry, None)
+    assert new_reference == MantarayNode.from_entries(entries).save(storage.save)
+
+    for save_kwargs in [{"max_workers": 2}, {}]:
+        loaded_node.remove_path(path)
+        saves = storage.save_count
+        loaded_node.save(storage.save, **save_kwargs)
+        assert storage.save_count - saves == nodes_on_path - 1
+        loaded_node.add_fork(path, new_entry)
+        assert loaded_node.save(storage.save, **save_kwargs) == new_reference
+
+
+def test_changes_of_an_unresolved_node_keep_its_forks():
+    entries = [(b"a/1", gen_32_bytes(), None), (b"a/2", gen_32_bytes(), None), (b"b", gen_32_bytes(), None)]
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries(entries).save(storage.save)
+
+    loaded_node = MantarayNode()
+    loaded_node.load(storage.load, reference)
+    loaded_node.forks[ord("b")].node.make_dirty()
+    assert loaded_node.save(storage.save) == reference
+
+    # * the fork node of "a/" has not been loaded yet
+    new_entry = gen_32_bytes()
+    loaded_node.forks[ord("a")].node.set_entry(new_entry)
+    loaded_node.forks[ord("a")].node.set_metadata({"Content-Type": "text/plain"})
+    new_reference = loaded_node.save(storage.save)
+
+    reloaded_node = MantarayNode()
+    reloaded_node.load(storage.load, new_reference)
+    assert list(reloaded_node.iter_entries()) == [(b"a/", new_entry, {"Content-Type": "text/plain"}), *entries]
+
+
+def test_save_stores_the_changes_of_a_hand_attached_fork():
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries([(b"index.html", gen_32_bytes(), None)]).save(storage.save)
+    loaded_node = MantarayNode()
+    loaded_node.load(storage.load, reference)
+
+    child = MantarayNode()
+    child.set_entry(gen_32_bytes())
+    loaded_node.forks[ord("a")] = MantarayFork(prefix=b"about.html", node=child)
+    assert loaded_node.is_dirty()
+    attached_reference = loaded_node.save(storage.save)
+
+    # * the fork node is linked to the node of the mapping, so its changes make the root dirty
+    new_entry = gen_32_bytes()
+    child.set_entry(new_entry)
+    assert loaded_node.is_dirty()
+    new_reference = loaded_node.save(storage.save)
+    assert new_reference != attached_reference
+
+    reloaded_node = MantarayNode()
+    reloaded_node.load(storage.load, new_reference)
+    assert reloaded_node.get_fork_at_path(b"about.html").node.get_entry() == new_entry
+
+    del loaded_node.forks[ord("a")]
+    assert loaded_node.save(storage.save) == reference
+
+
+def test_diff_compares_manifests_by_content_address():
+    entries = {f"dir-{i % 10}/sub-{i % 7}/file-{i}.txt".encode(): (gen_32_bytes(), None) for i in range(300)}
+    entries[b"dir-1/sub-1/file-1.txt"] = (gen_32_bytes(), {"Content-Type": "text/plain"})
+    other_entries = dict(entries)
+    other_entries[b"dir-4/sub-4/file-4.txt"] = (gen_32_bytes(), None)
+    other_entries[b"dir-1/sub-1/file-1.txt"] = (entries[b"dir-1/sub-1/file-1.txt"][0], {"Content-Type": "text/html"})
+    del other_entries[b"dir-5/sub-5/file-5.txt"]
+    del other_entries[b"dir-9/sub-0/file-189.txt"]
+    other_entries[b"dir-2/sub-2/new.txt"] = (gen_32_bytes(), None)
+    # * splits the prefixes of the "file-" forks of the directory differently
+    other_entries[b"dir-3/sub-3/f"] = (gen_32_bytes(), None)
+
+    expected = (
+        sorted(other_entries.keys() - entries.keys()),
+        sorted(entries.keys() - other_entries.keys()),
+        sorted(path for path in entries.keys() & other_entries.keys() if entries[path] != other_entries[path]),
+    )
+    node = MantarayNode.from_entries([(path, *entry) for path, entry in entries.items()])
+    other_node = MantarayNode.from_entries([(path, *entry) for path, entry in other_entries.items()])
+    assert tuple(node.diff(other_node)) == expected
+    assert tuple(node.diff(node)) == ([], [], [])
+
+    storage = InMemoryStorageHandler()
+    reference, other_reference = node.save(storage.save), other_node.save(storage.save)
+    loads = storage.load_count
+    result = diff(reference, other_reference, storage.load)
+    assert tuple(result) == expected
+    # * only the chunks along the differing paths are loaded
+    assert storage.load_count - loads < len(storage) // 4
+    assert tuple(diff(other_reference, node, storage.load)) == (expected[1], expected[0], expected[2])
+
+    loaded_node = MantarayNode()
+    loaded_node.load(storage.load, reference)
+    assert loaded_node == node
+    assert loaded_node != other_node
+
+    with pytest.raises(ValueError):
+        diff(reference, other_reference)
+
+
+def test_persistent_versions_share_the_unchanged_forks():
+    entries = {f"dir-{i % 10}/sub-{i % 7}/file-{i}.txt".encode(): gen_32_bytes() for i in range(300)}
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries([(path, entry, None) for path, entry in entries.items()]).save(storage.save)
+    base = MantarayNode()
+    base.load(storage.load, reference)
+
+    def saved_reference(entries):
+        return MantarayNode.from_entries([(path, entry, None) for path, entry in entries.items()]).save(storage.save)
+
+    changed_entries = dict(entries)
+    changed_entries[b"dir-3/sub-2/file-23.txt"] = gen_32_bytes()
+    # * splits the prefixes of the "file-" forks of the directory
+    changed_entries[b"dir-3/sub-3/f"] = gen_32_bytes()
+    del changed_entries[b"dir-5/sub-5/file-5.txt"]
+    version = base
+    for path in [b"dir-3/sub-2/file-23.txt", b"dir-3/sub-3/f"]:
+        version = version.with_fork(path, changed_entries[path])
+    version = version.without_path(b"dir-5/sub-5/file-5.txt")
+
+    # * the earlier version is not changed
+    assert {path: entry for path, entry, _ in base.iter_entries()} == entries
+    assert not base.is_dirty()
+    assert {path: entry for path, entry, _ in version.iter_entries()} == changed_entries
+    assert base.get_fork_at_path(b"dir-1/sub-").node is version.get_fork_at_path(b"dir-1/sub-").node
+
+    changed_reference = saved_reference(changed_entries)
+    saves = storage.save_count
+    assert version.save(storage.save) == changed_reference
+    assert base.save(storage.save) == reference
+    # * the root, "dir-", the 4 nodes to "file-23.txt" and the 2 nodes over the removed path are saved with the
+    # * node that splits "3/file-". The split "ile-" node is copied, but its chunk stays the same
+    assert storage.save_count - saves == 9
+
+    with pytest.raises(NotFoundError):
+        base.without_path(b"dir-5/sub-5/missing.txt")
+
+
+def test_apply_matches_changes_applied_one_by_one():
+    long_directory = b"a/very/long/directory/name/that/does/not/fit/into/one/prefix/"
+    entries = [(f"dir-{i % 10}/sub-{i % 7}/file-{i}.txt".encode(), gen_32_bytes(), None) for i in range(200)]
+    changes = [
+        (b"dir-1/sub-1/file-1.txt", gen_32_bytes(), {"Content-Type": "text/plain"}),
+        (b"dir-2/sub-2/file-2.txt", None, None),
+        (b"dir-3/sub-3/f", gen_32_bytes(), None),
+        (b"dir-3/sub-3/file-3.txt/index.html", gen_32_bytes(), None),
+        (b"dir-4/sub-4/file-4.txt", None, None),
+        (b"dir-4/sub-4/file-4.txt", gen_32_bytes(), None),
+        (b"", gen_32_bytes(), {"website-index-document": "index.html"}),
+        *[(long_directory + f"file-{i}.txt".encode(), gen_32_bytes(), None) for i in range(20)],
+        *[(f"dir-{i % 10}/new-{i}.txt".encode(), gen_32_bytes(), None) for i in range(30)],
+    ]
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries(entries).save(storage.save)
+
+    for loaded in [False, True]:
+        nodes = []
+        for _ in range(2):
+            node = MantarayNode.from_entries(entries)
+            if loaded:
+                node = MantarayNode()
+                node.load(storage.load, reference)
+            nodes.append(node)
+        node, applied_node = nodes
+        for path, entry, metadata in sorted(changes, key=lambda change: change[0]):
+            if entry is None:
+                node.remove_path(path)
+            else:
+                node.add_fork(path, entry, metadata)
+        applied_node.apply(changes)
+        assert applied_node.save(storage.save) == node.save(storage.save)
+
+    with pytest.raises(NotFoundError):
+        node.apply([(b"dir-2/sub-2/file-2.txt", None, None)])
+
+
+def test_remove_path_compacts_the_emptied_nodes():
+    entries = {
+        b"index.html": gen_32_bytes(),
+        b"img": gen_32_bytes(),
+        b"img/logo.png": gen_32_bytes(),
+        b"img/logo.svg": gen_32_bytes(),
+        b"img/icons/a.svg": gen_32_bytes(),
+        b"img/icons/b.svg": gen_32_bytes(),
+        b"img/icons/c.png": gen_32_bytes(),
+        b"style.css": gen_32_bytes(),
+    }
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries([(path, entry, None) for path, entry in entries.items()]).save(storage.save)
+    removed_paths = [b"img/logo.png", b"img/logo.svg", b"img/icons/a.svg", b"img/icons/c.png"]
+    remaining_entries = [(path, entry, None) for path, entry in entries.items() if path not in removed_paths]
+
+    node, compacted_node = MantarayNode(), MantarayNode()
+    node.load(storage.load, reference)
+    compacted_node.load(storage.load, reference)
+    for path in removed_paths:
+        node.remove_path(path)
+        compacted_node.remove_path(path, compact=True)
+
+    assert list(compacted_node.iter_entries()) == list(node.iter_entries())
+    assert compacted_node.save(storage.save) == MantarayNode.from_entries(remaining_entries).save(storage.save)
+    # * the "img/icons/" edge is merged into the fork of "b.svg", the emptied "img/logo." edge is removed
+    assert compacted_node.get_fork_at_path(b"img").node.forks[ord("/")].prefix == b"/icons/b.svg"
+    assert set(node.get_fork_at_path(b"img/").node.forks) == {ord("i"), ord("l")}
+
+
+def test_remove_path_repacks_a_long_chain():
+    entries = {b"aba": gen_32_bytes(), b"abc" + b"x" * 40: gen_32_bytes()}
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries([(path, entry, None) for path, entry in entries.items()]).save(storage.save)
+
+    node = MantarayNode()
+    node.load(storage.load, reference)
+    node.remove_path(b"aba", compact=True)
+
+    prefix_sizes, fork = [], node.forks[ord("a")]
+    while fork:
+        prefix_sizes.append(len(fork.prefix))
+        fork = next(iter((fork.node.forks or {}).values()), None)
+    # * the joined 43 bytes long prefix is split to a full edge and the rest, as a new path is chunked
+    assert prefix_sizes == [30, 13]
+    remaining_entries = [(b"abc" + b"x" * 40, entries[b"abc" + b"x" * 40], None)]
+    assert node.save(storage.save) == MantarayNode.from_entries(remaining_entries).save(storage.save)
+
+
+def test_list_pages_through_a_directory_lazily():
+    entries = sorted(
+        [
+            (b"", gen_32_bytes(), None),
+            (b"index.html", gen_32_bytes(), {"Content-Type": "text/html"}),
+            (b"img/logo.png", gen_32_bytes(), None),
+            (b"img/icons/a.svg", gen_32_bytes(), None),
+            (b"img/icons/b.svg", gen_32_bytes(), None),
+            (b"img/photos/a.jpg", gen_32_bytes(), None),
+            (b"img", gen_32_bytes(), None),
+            (b"img-2.png", gen_32_bytes(), None),
+            (b"style.css", gen_32_bytes(), None),
+        ]
+    )
+    storage = InMemoryStorageHandler()
+    reference = MantarayNode.from_entries(entries).save(storage.save)
+    node = MantarayNode()
+    node.load(storage.load, reference)
+
+    page = node.list()
+    assert [path for path, _, _ in page.entries] == [b"", b"img", b"img-2.png", b"index.html", b"style.css"]
+    assert page.entries[3] == entries[7]
+    assert page.common_prefixes == [b"img/"]
+    assert page.next_start_after is None
+
+    # * the subdirectories of "img/" are rolled up without fetching their chunks, only the nodes on the way
+    # * and the listed entry are fetched
+    loads = storage.load_count
+    page = node.list(b"img/", limit=2)
+    assert page == ([entries[5]], [b"img/icons/"], b"img/logo.png")
+    assert storage.load_count - loads == len([b"i", b"img", b"img/", b"img/logo.png"])
+    page = node.list(b"img/", start_after=page.next_start_after, limit=2)
+    assert page == ([], [b"img/photos/"], None)
+
+    assert [path for path, _, _ in node.list(b"img/", delimiter=None).entries] == [
+        b"img/icons/a.svg",
+        b"img/icons/b.svg",
+        b"img/logo.png",
+        b"img/photos/a.jpg",
+    ]
+    with pytest.raises(ValueError):
+        node.list(limit=0)
+
+
+def test_equal_nodes_compare_their_structure_before_and_after_save(get_sample_mantaray_node):
+    node = get_sample_mantaray_node["node"]
+    paths = get_sample_mantaray_node["paths"]
+    unsaved_node = MantarayNode()
+    unsaved_node.set_entry(node.get_entry())
+    for path in paths:
+        fork_node = node.get_fork_at_path(path).node
+        unsaved_node.add_fork(path, fork_node.get_entry(), fork_node.get_metadata())
+    assert unsaved_node == node
+
+    storage = InMemoryStorageHandler()
+    node.save(storage.save)
+    node_again = MantarayNode()
+    node_again.deserialise(node.serialise())
+    load_all_nodes(storage.load, node_again)
+    assert node == node_again
+    assert node_again == unsaved_node
+
+    unsaved_node.add_fork(paths[0], node.get_entry(), {"vmi": "masik"})
+    assert unsaved_node != node
+    node_again.make_dirty()
+    assert node_again == node
+
+    # * nodes and forks are mutable and compared by their content, so they cannot be hashed
+    for unhashable in [node, node.forks[ord("p")], MantarayNode()]:
+        with pytest.raises(TypeError):
+            hash(unhashable)